@@ -0,0 +1,102 @@
+"""Compares the response serialization paths on a 2,000-problem payload.
+
+Run with ``python -m benchmarks.serialization``.
+"""
+
+import argparse
+import random
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from src.models.enum import Difficulty
+from src.utils.responses import FastJSONResponse, lean_response
+
+TOPICS = ["Arrays", "Hashing", "Two Pointers", "Stack", "Trees", "Graphs", "DP"]
+LISTS = ["Blind 75", "NeetCode 150", "Grind 169"]
+
+
+class BenchProblem(BaseModel):
+    id: uuid.UUID
+    name: str
+    difficulty: Difficulty
+    totalbookmarks: int
+    totaluserssolved: int
+    hassolved: bool
+    acceptance: Decimal
+    created_at: datetime
+    topics: list[str] | None
+    lists: list[str] | None
+
+
+def make_rows(count: int):
+    """Rows shaped like the /problems catalog, as SQLAlchemy RowMappings."""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    keys = list(BenchProblem.model_fields)
+    tuples = [
+        (
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            f"Problem {i} {rng.choice(TOPICS)}",
+            rng.choice(list(Difficulty)),
+            rng.randint(0, 5000),
+            rng.randint(0, 50000),
+            rng.random() < 0.3,
+            Decimal(rng.randint(0, 10000)) / 100,
+            start + timedelta(minutes=i),
+            rng.sample(TOPICS, rng.randint(1, 3)),
+            rng.sample(LISTS, rng.randint(0, 2)) or None,
+        )
+        for i in range(count)
+    ]
+    result = IteratorResult(SimpleResultMetaData(keys), iter(tuples))
+    return result.mappings().all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    adapter = TypeAdapter(list[BenchProblem])
+
+    paths = {
+        # What a handler returning rows got before: FastAPI's encoder, then
+        # the stdlib json module.
+        "jsonable_encoder + JSONResponse": lambda: JSONResponse(
+            jsonable_encoder(rows)
+        ).body,
+        # The same handler now: the encoder still runs, only dumping is faster.
+        "jsonable_encoder + FastJSONResponse": lambda: FastJSONResponse(
+            jsonable_encoder(rows)
+        ).body,
+        # A response_model route: validate into models, then dump.
+        "pydantic validate + dump": lambda: adapter.dump_json(
+            adapter.validate_python(rows, from_attributes=True)
+        ),
+        "lean_response": lambda: lean_response(rows).body,
+    }
+
+    baseline = None
+    for name, path in paths.items():
+        best = min(timeit.repeat(path, repeat=args.repeat, number=args.number))
+        per_call = best / args.number * 1000
+        baseline = baseline or per_call
+        size = len(path())
+        print(
+            f"{name:38} {per_call:8.2f} ms  {baseline / per_call:5.1f}x"
+            f"  {size:,} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
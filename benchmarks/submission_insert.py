@@ -0,0 +1,190 @@
+"""Round trips and latency of the ORM and single-statement submission inserts.
+
+Needs DATABASE_URL pointing at a migrated database with at least one user
+and problem. It writes real submissions, so run it against a scratch copy.
+
+Run with ``python -m benchmarks.submission_insert``.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.code_store import code_store
+from src.core.db import sessionmanager
+from src.models.enum import Status
+from src.models.problem import Problem
+from src.models.submission import Submission
+from src.models.user import User
+from src.models.user_solution import UserSolution
+from src.queries import queries
+
+
+class RoundTripProxy:
+    """TCP proxy that counts client/server round trips.
+
+    A round trip is counted each time the client starts sending again after
+    the server has answered, so pipelined messages count once.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.round_trips = 0
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(
+            self.host, self.port
+        )
+        # Whose turn it was last; the startup handshake is not counted.
+        state = {"last": "server"}
+
+        async def pipe(reader, writer, side):
+            try:
+                while data := await reader.read(65536):
+                    if side == "client" and state["last"] == "server":
+                        self.round_trips += 1
+                    state["last"] = side
+                    writer.write(data)
+                    await writer.drain()
+            finally:
+                writer.close()
+
+        await asyncio.gather(
+            pipe(client_reader, server_writer, "client"),
+            pipe(server_reader, client_writer, "server"),
+            return_exceptions=True,
+        )
+
+
+async def orm_insert(session, user_id, problem_id):
+    # The handler as it was: flush for the solution id, commit, then a
+    # refresh that reloads the submission with its joined relationships.
+    user_solution = UserSolution(
+        code="print(1)", has_solved=True, user_id=user_id, problem_id=problem_id
+    )
+    session.add(user_solution)
+    await session.flush()
+
+    submission = Submission(
+        status=Status.Accepted,
+        user_id=user_id,
+        problem_id=problem_id,
+        user_solution_id=user_solution.id,
+        passed_testcases=3,
+        total_testcases=3,
+    )
+    session.add(submission)
+    await session.execute(
+        text(
+            "INSERT INTO solved_problem (user_id, problem_id, solved_at) "
+            "VALUES (:user_id, :problem_id, NOW()) ON CONFLICT DO NOTHING"
+        ),
+        {"user_id": user_id, "problem_id": problem_id},
+    )
+    await session.commit()
+    await session.refresh(submission)
+    return submission.id
+
+
+async def cte_insert(session, user_id, problem_id):
+    code = code_store.encode("print(1)")
+    result = await queries.execute(
+        session,
+        "user.insert_submission",
+        {
+            "code_hash": code.hash,
+            "code_dictionary_id": code.dictionary_id,
+            "code_data": code.data,
+            "code_size": code.size,
+            "has_solved": True,
+            "user_id": user_id,
+            "problem_id": problem_id,
+            "status": Status.Accepted.value,
+            "passed_testcases": 3,
+            "total_testcases": 3,
+        },
+    )
+    submission_id, _ = result.one()
+    await session.commit()
+    return submission_id
+
+
+async def measure(name, insert, proxy, sessionmaker, user_id, problem_id, runs):
+    # Warm the pool and the prepared statement caches first.
+    for _ in range(3):
+        async with sessionmaker() as session:
+            await insert(session, user_id, problem_id)
+
+    latencies = []
+    proxy.round_trips = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        async with sessionmaker() as session:
+            await insert(session, user_id, problem_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(
+        f"{name:22} {proxy.round_trips / runs:5.1f} round trips"
+        f"  median {statistics.median(latencies):7.2f} ms"
+        f"  p95 {statistics.quantiles(latencies, n=20)[-1]:7.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    url = sessionmanager.engine.url
+    proxy = RoundTripProxy(url.host or "localhost", url.port or 5432)
+    port = await proxy.start()
+    engine = create_async_engine(url.set(host="127.0.0.1", port=port), pool_size=1)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=True)
+
+    try:
+        async with sessionmaker() as session:
+            user_id = (await session.execute(select(User.id).limit(1))).scalar_one()
+            problem_id = (
+                await session.execute(select(Problem.id).limit(1))
+            ).scalar_one()
+
+        await measure(
+            "ORM add/flush/refresh",
+            orm_insert,
+            proxy,
+            sessionmaker,
+            user_id,
+            problem_id,
+            args.runs,
+        )
+        await measure(
+            "single CTE statement",
+            cte_insert,
+            proxy,
+            sessionmaker,
+            user_id,
+            problem_id,
+            args.runs,
+        )
+    finally:
+        await engine.dispose()
+        await sessionmanager.close()
+        await proxy.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,6 +8,11 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from src.core.db import Base, sessionmanager
+from src.utils.partitions import (
+    PARTITIONED_TABLES,
+    default_partition_name,
+    partition_month,
+)
 import src.models
 
 # this is the Alembic Config object, which provides
@@ -28,6 +33,26 @@ config.set_main_option(
     "sqlalchemy.url", sessionmanager._engine.url.render_as_string(hide_password=False)
 )
 
+
+def is_partition(name: str) -> bool:
+    return any(
+        partition_month(table, name) or name == default_partition_name(table)
+        for table in PARTITIONED_TABLES
+    )
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Monthly partitions are managed by src.commands.manage_partitions, not
+    # by migrations; so are the foreign keys Postgres adds for each of them.
+    if type_ == "table":
+        return not is_partition(name)
+    if type_ == "index":
+        return not is_partition(object.table.name)
+    if type_ == "foreign_key_constraint":
+        return not is_partition(object.referred_table.name)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -62,7 +87,10 @@ def do_run_migrations(connection: Connection) -> None:
     print(f"Loaded models: {list(Base.metadata.tables.keys())}")
 
     context.configure(
-        connection=connection, target_metadata=target_metadata, render_as_batch=True
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
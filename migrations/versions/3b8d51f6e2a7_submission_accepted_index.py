@@ -0,0 +1,30 @@
+"""submission accepted index
+
+Revision ID: 3b8d51f6e2a7
+Revises: 7c2e9a41d0b3
+Create Date: 2026-10-18 14:03:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8d51f6e2a7'
+down_revision: Union[str, None] = '7c2e9a41d0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.create_index('ix_submission_user_id_accepted', ['user_id', 'problem_id'], unique=False, postgresql_where=sa.text("status = 'Accepted'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_user_id_accepted', postgresql_where=sa.text("status = 'Accepted'"))
@@ -0,0 +1,30 @@
+"""submission history index
+
+Revision ID: 5f1c3e8a7b20
+Revises: d2f6a8b4c913
+Create Date: 2026-10-18 19:42:07.331845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1c3e8a7b20'
+down_revision: Union[str, None] = 'd2f6a8b4c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.create_index('ix_submission_user_id_problem_id_created_at', ['user_id', 'problem_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_user_id_problem_id_created_at')
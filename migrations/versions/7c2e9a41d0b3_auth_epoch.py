@@ -0,0 +1,33 @@
+"""auth epoch
+
+Revision ID: 7c2e9a41d0b3
+Revises: 4dab5b998bda
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a41d0b3'
+down_revision: Union[str, None] = '4dab5b998bda'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('auth_epoch',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('epoch', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('fk_auth_epoch_user_id_user'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', name=op.f('pk_auth_epoch'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('auth_epoch')
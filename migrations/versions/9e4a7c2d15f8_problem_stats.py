@@ -0,0 +1,108 @@
+"""problem stats
+
+Revision ID: 9e4a7c2d15f8
+Revises: 3b8d51f6e2a7
+Create Date: 2026-10-18 15:21:46.203917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a7c2d15f8'
+down_revision: Union[str, None] = '3b8d51f6e2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('problem_stats',
+    sa.Column('problem_id', sa.Uuid(), nullable=False),
+    sa.Column('bookmark_count', sa.Integer(), nullable=False),
+    sa.Column('solved_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problem.id'], name=op.f('fk_problem_stats_problem_id_problem'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('problem_id', name=op.f('pk_problem_stats'))
+    )
+    op.create_table('solved_problem',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('problem_id', sa.Uuid(), nullable=False),
+    sa.Column('solved_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problem.id'], name=op.f('fk_solved_problem_problem_id_problem'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('fk_solved_problem_user_id_user'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'problem_id', name=op.f('pk_solved_problem'))
+    )
+
+    op.execute("""
+        INSERT INTO solved_problem (user_id, problem_id, solved_at)
+        SELECT user_id, problem_id, MIN(created_at)
+        FROM submission
+        WHERE status = 'Accepted'
+        GROUP BY user_id, problem_id
+    """)
+    op.execute("""
+        INSERT INTO problem_stats (problem_id, bookmark_count, solved_count)
+        SELECT
+          p.id,
+          (SELECT COUNT(*) FROM bookmark b WHERE b.problem_id = p.id),
+          (SELECT COUNT(*) FROM solved_problem sp WHERE sp.problem_id = p.id)
+        FROM problem p
+    """)
+
+    op.execute("""
+        CREATE FUNCTION problem_stats_bookmark_count() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            INSERT INTO problem_stats (problem_id, bookmark_count, solved_count)
+            VALUES (NEW.problem_id, 1, 0)
+            ON CONFLICT (problem_id) DO UPDATE
+            SET bookmark_count = problem_stats.bookmark_count + 1;
+          ELSE
+            UPDATE problem_stats
+            SET bookmark_count = bookmark_count - 1
+            WHERE problem_id = OLD.problem_id;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER bookmark_problem_stats
+        AFTER INSERT OR DELETE ON bookmark
+        FOR EACH ROW EXECUTE FUNCTION problem_stats_bookmark_count()
+    """)
+    op.execute("""
+        CREATE FUNCTION problem_stats_solved_count() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            INSERT INTO problem_stats (problem_id, bookmark_count, solved_count)
+            VALUES (NEW.problem_id, 0, 1)
+            ON CONFLICT (problem_id) DO UPDATE
+            SET solved_count = problem_stats.solved_count + 1;
+          ELSE
+            UPDATE problem_stats
+            SET solved_count = solved_count - 1
+            WHERE problem_id = OLD.problem_id;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER solved_problem_problem_stats
+        AFTER INSERT OR DELETE ON solved_problem
+        FOR EACH ROW EXECUTE FUNCTION problem_stats_solved_count()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER solved_problem_problem_stats ON solved_problem")
+    op.execute("DROP FUNCTION problem_stats_solved_count()")
+    op.execute("DROP TRIGGER bookmark_problem_stats ON bookmark")
+    op.execute("DROP FUNCTION problem_stats_bookmark_count()")
+    op.drop_table('solved_problem')
+    op.drop_table('problem_stats')
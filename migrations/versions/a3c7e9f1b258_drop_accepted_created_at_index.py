@@ -0,0 +1,33 @@
+"""drop accepted created_at index
+
+Revision ID: a3c7e9f1b258
+Revises: f1d6b3e8a290
+Create Date: 2026-10-19 06:40:12.527301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e9f1b258'
+down_revision: Union[str, None] = 'f1d6b3e8a290'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # d2f8b4a6c913 drops this index, but a database upgraded while that
+    # revision briefly left it in place still has it. The history index
+    # covers (user_id, problem_id), and the stats endpoints read
+    # user_progress.
+    op.execute('DROP INDEX IF EXISTS ix_submission_user_id_accepted_created_at')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nothing to restore: at f1d6b3e8a290 the index is already gone.
+    pass
@@ -0,0 +1,44 @@
+"""cached verdict
+
+Revision ID: a8d4e1f7c350
+Revises: f3a9d2c6b871
+Create Date: 2026-10-18 23:02:17.384519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4e1f7c350'
+down_revision: Union[str, None] = 'f3a9d2c6b871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cached_verdict',
+    sa.Column('code_hash', sa.LargeBinary(), nullable=False),
+    sa.Column('problem_id', sa.Uuid(), nullable=False),
+    sa.Column('testcase_version', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM('Accepted', 'Rejected', 'Pending', 'TimeLimit', 'MemoryLimit', 'RuntimeError', name='status', create_type=False), nullable=False),
+    sa.Column('passed_testcases', sa.Integer(), nullable=False),
+    sa.Column('total_testcases', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problem.id'], name=op.f('fk_cached_verdict_problem_id_problem'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('code_hash', 'problem_id', 'testcase_version', name=op.f('pk_cached_verdict'))
+    )
+    with op.batch_alter_table('problem', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('testcase_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('problem', schema=None) as batch_op:
+        batch_op.drop_column('testcase_version')
+
+    op.drop_table('cached_verdict')
@@ -0,0 +1,163 @@
+"""partition submission
+
+Revision ID: b5e2f9c7d416
+Revises: a8d4e1f7c350
+Create Date: 2026-10-18 23:41:09.517263
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.utils.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition_sql,
+    month_start,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2f9c7d416'
+down_revision: Union[str, None] = 'a8d4e1f7c350'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created past the current month; the manage_partitions
+# command keeps this many ahead afterwards.
+MONTHS_AHEAD = 3
+
+STATUS = postgresql.ENUM('Accepted', 'Rejected', 'Pending', 'TimeLimit', 'MemoryLimit', 'RuntimeError', name='status', create_type=False)
+
+USER_SOLUTION_COLUMNS = 'id, code, has_solved, user_id, problem_id, created_at, updated_at, code_hash'
+SUBMISSION_COLUMNS = 'id, status, user_id, problem_id, user_solution_id, passed_testcases, total_testcases, created_at, updated_at'
+
+
+def _user_solution_table(name: str, *constraints, **kw) -> None:
+    op.create_table(name,
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('code', sa.String(), nullable=True),
+    sa.Column('has_solved', sa.Boolean(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('problem_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('code_hash', sa.LargeBinary(), nullable=True),
+    sa.ForeignKeyConstraint(['code_hash'], ['code_blob.hash'], name=op.f('fk_user_solution_code_hash_code_blob')),
+    sa.ForeignKeyConstraint(['problem_id'], ['problem.id'], name=op.f('fk_user_solution_problem_id_problem'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('fk_user_solution_user_id_user'), ondelete='CASCADE'),
+    *constraints,
+    **kw
+    )
+
+
+def _submission_table(name: str, *constraints, **kw) -> None:
+    op.create_table(name,
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('status', STATUS, nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('problem_id', sa.Uuid(), nullable=False),
+    sa.Column('user_solution_id', sa.Uuid(), nullable=False),
+    sa.Column('passed_testcases', sa.Integer(), nullable=False),
+    sa.Column('total_testcases', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problem.id'], name=op.f('fk_submission_problem_id_problem')),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('fk_submission_user_id_user'), ondelete='CASCADE'),
+    *constraints,
+    **kw
+    )
+
+
+def _create_indexes() -> None:
+    with op.batch_alter_table('user_solution', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_solution_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_user_solution_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_submission_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_submission_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index('ix_submission_user_id_accepted', ['user_id', 'problem_id'], unique=False, postgresql_where=sa.text("status = 'Accepted'"))
+        batch_op.create_index('ix_submission_user_id_problem_id_created_at', ['user_id', 'problem_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def _drop_indexes() -> None:
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_user_id_problem_id_created_at')
+        batch_op.drop_index('ix_submission_user_id_accepted', postgresql_where=sa.text("status = 'Accepted'"))
+        batch_op.drop_index(batch_op.f('ix_submission_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_submission_created_at'))
+
+    with op.batch_alter_table('user_solution', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_solution_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_user_solution_created_at'))
+
+
+def _set_aside_tables() -> None:
+    # The old tables keep their rows until they are copied; their index and
+    # primary key names are schema-wide, so those are freed first.
+    op.drop_constraint('fk_submission_user_solution_id_user_solution', 'submission', type_='foreignkey')
+    _drop_indexes()
+    for table in PARTITIONED_TABLES:
+        op.rename_table(table, f'{table}_old')
+        op.execute(f'ALTER TABLE {table}_old RENAME CONSTRAINT pk_{table} TO pk_{table}_old')
+
+
+def _copy_and_drop_old_tables() -> None:
+    op.execute(f'INSERT INTO user_solution ({USER_SOLUTION_COLUMNS}) SELECT {USER_SOLUTION_COLUMNS} FROM user_solution_old')
+    op.execute(f'INSERT INTO submission ({SUBMISSION_COLUMNS}) SELECT {SUBMISSION_COLUMNS} FROM submission_old')
+    op.drop_table('submission_old')
+    op.drop_table('user_solution_old')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text(
+        "SELECT LEAST("
+        "(SELECT MIN(created_at) FROM user_solution), "
+        "(SELECT MIN(created_at) FROM submission))"
+    )).scalar()
+    current = month_start(datetime.now(timezone.utc).date())
+    first = month_start(oldest.astimezone(timezone.utc).date()) if oldest else current
+
+    _set_aside_tables()
+
+    # Both tables are split by month of created_at. A submission and its
+    # user_solution are written in one transaction and share created_at,
+    # so the foreign key pairs rows in the same month.
+    _user_solution_table('user_solution',
+    sa.PrimaryKeyConstraint('id', 'created_at', name=op.f('pk_user_solution')),
+    postgresql_partition_by='RANGE (created_at)')
+    _submission_table('submission',
+    sa.PrimaryKeyConstraint('id', 'created_at', name=op.f('pk_submission')),
+    postgresql_partition_by='RANGE (created_at)')
+
+    month = first
+    while month <= add_months(current, MONTHS_AHEAD):
+        for table in PARTITIONED_TABLES:
+            op.execute(create_partition_sql(table, month))
+        month = add_months(month, 1)
+
+    _copy_and_drop_old_tables()
+    _create_indexes()
+    op.create_foreign_key(op.f('fk_submission_user_solution_id_user_solution'), 'submission', 'user_solution', ['user_solution_id', 'created_at'], ['id', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_aside_tables()
+
+    _user_solution_table('user_solution',
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_user_solution')))
+    _submission_table('submission',
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_submission')))
+
+    # Dropping the old partitioned parents drops every partition with them;
+    # partitions already detached by manage_partitions are left alone.
+    _copy_and_drop_old_tables()
+    _create_indexes()
+    op.create_foreign_key(op.f('fk_submission_user_solution_id_user_solution'), 'submission', 'user_solution', ['user_solution_id'], ['id'])
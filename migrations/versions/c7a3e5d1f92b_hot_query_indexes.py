@@ -0,0 +1,78 @@
+"""hot query indexes
+
+Revision ID: c7a3e5d1f92b
+Revises: b5e2f9c7d416
+Create Date: 2026-10-19 01:12:47.803512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3e5d1f92b'
+down_revision: Union[str, None] = 'b5e2f9c7d416'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# No query filters or sorts on these, so they only cost writes.
+UNUSED_CREATED_AT = ('bookmark', 'problem', 'solution', 'submission', 'testcase', 'topic', 'user', 'vote_problem', 'vote_solution')
+UNUSED_UPDATED_AT = ('bookmark', 'problem', 'solution', 'submission', 'testcase', 'topic', 'user', 'user_solution', 'vote_problem', 'vote_solution')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in UNUSED_CREATED_AT:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_created_at'))
+
+    for table in UNUSED_UPDATED_AT:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_updated_at'))
+
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_user_id_accepted', postgresql_where=sa.text("status = 'Accepted'"))
+        batch_op.create_index('ix_submission_user_id_accepted_created_at', ['user_id', 'created_at'], unique=False, postgresql_include=['problem_id'], postgresql_where=sa.text("status = 'Accepted'"))
+        batch_op.create_index('ix_submission_pending_updated_at', ['updated_at'], unique=False, postgresql_where=sa.text("status = 'Pending'"))
+
+    with op.batch_alter_table('testcase', schema=None) as batch_op:
+        batch_op.create_index('ix_testcase_problem_id_created_at', ['problem_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('topic_problem', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_topic_problem_problem_id'), ['problem_id'], unique=False)
+
+    with op.batch_alter_table('list_problem', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_list_problem_problem_id'), ['problem_id'], unique=False)
+
+    with op.batch_alter_table('solved_problem', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_solved_problem_problem_id'), ['problem_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('solved_problem', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_solved_problem_problem_id'))
+
+    with op.batch_alter_table('list_problem', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_list_problem_problem_id'))
+
+    with op.batch_alter_table('topic_problem', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_topic_problem_problem_id'))
+
+    with op.batch_alter_table('testcase', schema=None) as batch_op:
+        batch_op.drop_index('ix_testcase_problem_id_created_at')
+
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_pending_updated_at', postgresql_where=sa.text("status = 'Pending'"))
+        batch_op.drop_index('ix_submission_user_id_accepted_created_at', postgresql_include=['problem_id'], postgresql_where=sa.text("status = 'Accepted'"))
+        batch_op.create_index('ix_submission_user_id_accepted', ['user_id', 'problem_id'], unique=False, postgresql_where=sa.text("status = 'Accepted'"))
+
+    for table in UNUSED_UPDATED_AT:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(batch_op.f(f'ix_{table}_updated_at'), ['updated_at'], unique=False)
+
+    for table in UNUSED_CREATED_AT:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(batch_op.f(f'ix_{table}_created_at'), ['created_at'], unique=False)
@@ -0,0 +1,28 @@
+"""catalog version sequence
+
+Revision ID: d2f6a8b4c913
+Revises: 9e4a7c2d15f8
+Create Date: 2026-10-18 16:48:05.771342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6a8b4c913'
+down_revision: Union[str, None] = '9e4a7c2d15f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('catalog_version_seq')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('catalog_version_seq')))
@@ -0,0 +1,207 @@
+"""user progress
+
+Revision ID: d2f8b4a6c913
+Revises: c7a3e5d1f92b
+Create Date: 2026-10-19 02:36:18.441907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8b4a6c913'
+down_revision: Union[str, None] = 'c7a3e5d1f92b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copied from src.commands.backfill_user_progress as it was when this
+# revision was written, so later changes there do not alter it.
+BACKFILL_SQL = """
+    WITH months AS (
+      SELECT user_id, to_char(solved_at AT TIME ZONE 'UTC', 'YYYY-MM') AS month,
+             COUNT(*)::int AS solved
+      FROM solved_problem
+      GROUP BY 1, 2
+    ),
+    solved AS (
+      SELECT user_id, SUM(solved)::int AS total_solved,
+             jsonb_object_agg(month, solved) AS monthly_solved
+      FROM months
+      GROUP BY user_id
+    ),
+    days AS (
+      SELECT DISTINCT user_id, (created_at AT TIME ZONE 'UTC')::date AS day
+      FROM submission
+      WHERE status = 'Accepted'
+    ),
+    runs AS (
+      -- Consecutive days share day - row_number.
+      SELECT user_id, COUNT(*)::int AS length, MAX(day) AS last_day
+      FROM (
+        SELECT user_id, day,
+               day - (ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY day))::int
+                 AS run
+        FROM days
+      ) d
+      GROUP BY user_id, run
+    ),
+    streaks AS (
+      SELECT user_id,
+             (ARRAY_AGG(length ORDER BY last_day DESC))[1] AS current_streak,
+             MAX(length) AS longest_streak,
+             MAX(last_day) AS last_solved_on
+      FROM runs
+      GROUP BY user_id
+    )
+    INSERT INTO user_progress (
+      user_id, total_solved, monthly_solved,
+      current_streak, longest_streak, last_solved_on, updated_at
+    )
+    SELECT
+      COALESCE(so.user_id, st.user_id),
+      COALESCE(so.total_solved, 0),
+      COALESCE(so.monthly_solved, '{}'),
+      COALESCE(st.current_streak, 0),
+      COALESCE(st.longest_streak, 0),
+      st.last_solved_on,
+      NOW()
+    FROM solved so
+    FULL JOIN streaks st ON st.user_id = so.user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET total_solved = EXCLUDED.total_solved,
+        monthly_solved = EXCLUDED.monthly_solved,
+        current_streak = EXCLUDED.current_streak,
+        longest_streak = EXCLUDED.longest_streak,
+        last_solved_on = EXCLUDED.last_solved_on,
+        updated_at = EXCLUDED.updated_at
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_progress',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('total_solved', sa.Integer(), nullable=False),
+    sa.Column('monthly_solved', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('current_streak', sa.Integer(), nullable=False),
+    sa.Column('longest_streak', sa.Integer(), nullable=False),
+    sa.Column('last_solved_on', sa.Date(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('fk_user_progress_user_id_user'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', name=op.f('pk_user_progress'))
+    )
+    # The stats endpoints read user_progress now.
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_user_id_accepted_created_at', postgresql_include=['problem_id'], postgresql_where=sa.text("status = 'Accepted'"))
+
+    op.execute(BACKFILL_SQL)
+
+    # A problem counts towards the month it was first solved in.
+    op.execute("""
+        CREATE FUNCTION user_progress_solved() RETURNS trigger AS $$
+        DECLARE
+          month text;
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            month := to_char(NEW.solved_at AT TIME ZONE 'UTC', 'YYYY-MM');
+            INSERT INTO user_progress (
+              user_id, total_solved, monthly_solved,
+              current_streak, longest_streak, updated_at
+            )
+            VALUES (NEW.user_id, 1, jsonb_build_object(month, 1), 0, 0, NOW())
+            ON CONFLICT (user_id) DO UPDATE
+            SET total_solved = user_progress.total_solved + 1,
+                monthly_solved = user_progress.monthly_solved || jsonb_build_object(
+                  month, COALESCE((user_progress.monthly_solved ->> month)::int, 0) + 1
+                ),
+                updated_at = NOW();
+          ELSE
+            month := to_char(OLD.solved_at AT TIME ZONE 'UTC', 'YYYY-MM');
+            UPDATE user_progress
+            SET total_solved = total_solved - 1,
+                monthly_solved = monthly_solved || jsonb_build_object(
+                  month, COALESCE((monthly_solved ->> month)::int, 0) - 1
+                ),
+                updated_at = NOW()
+            WHERE user_id = OLD.user_id;
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER solved_problem_user_progress
+        AFTER INSERT OR DELETE ON solved_problem
+        FOR EACH ROW EXECUTE FUNCTION user_progress_solved()
+    """)
+
+    # A day with an accepted submission extends the streak if it follows
+    # the last such day, and restarts it after a gap. A verdict for an
+    # earlier day than the last one leaves the streak alone.
+    op.execute("""
+        CREATE FUNCTION user_progress_streak(
+          streak int, last_solved_on date, solved_on date
+        ) RETURNS int AS $$
+          SELECT CASE
+            WHEN last_solved_on IS NULL OR last_solved_on < solved_on - 1 THEN 1
+            WHEN last_solved_on = solved_on - 1 THEN streak + 1
+            ELSE streak
+          END
+        $$ LANGUAGE sql IMMUTABLE
+    """)
+    op.execute("""
+        CREATE FUNCTION user_progress_accepted() RETURNS trigger AS $$
+        DECLARE
+          solved_on date := (NEW.created_at AT TIME ZONE 'UTC')::date;
+        BEGIN
+          INSERT INTO user_progress (
+            user_id, total_solved, monthly_solved,
+            current_streak, longest_streak, last_solved_on, updated_at
+          )
+          VALUES (NEW.user_id, 0, '{}', 1, 1, solved_on, NOW())
+          ON CONFLICT (user_id) DO UPDATE
+          SET current_streak = user_progress_streak(
+                user_progress.current_streak, user_progress.last_solved_on, solved_on
+              ),
+              longest_streak = GREATEST(
+                user_progress.longest_streak,
+                user_progress_streak(
+                  user_progress.current_streak, user_progress.last_solved_on, solved_on
+                )
+              ),
+              last_solved_on = GREATEST(user_progress.last_solved_on, solved_on),
+              updated_at = NOW();
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER submission_user_progress_insert
+        AFTER INSERT ON submission
+        FOR EACH ROW WHEN (NEW.status = 'Accepted')
+        EXECUTE FUNCTION user_progress_accepted()
+    """)
+    op.execute("""
+        CREATE TRIGGER submission_user_progress_verdict
+        AFTER UPDATE OF status ON submission
+        FOR EACH ROW WHEN (OLD.status <> 'Accepted' AND NEW.status = 'Accepted')
+        EXECUTE FUNCTION user_progress_accepted()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER submission_user_progress_verdict ON submission")
+    op.execute("DROP TRIGGER submission_user_progress_insert ON submission")
+    op.execute("DROP FUNCTION user_progress_accepted()")
+    op.execute("DROP FUNCTION user_progress_streak(int, date, date)")
+    op.execute("DROP TRIGGER solved_problem_user_progress ON solved_problem")
+    op.execute("DROP FUNCTION user_progress_solved()")
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.create_index('ix_submission_user_id_accepted_created_at', ['user_id', 'created_at'], unique=False, postgresql_include=['problem_id'], postgresql_where=sa.text("status = 'Accepted'"))
+
+    op.drop_table('user_progress')
@@ -0,0 +1,30 @@
+"""judge system error
+
+Revision ID: e5c1a7f3b924
+Revises: d2f8b4a6c913
+Create Date: 2026-10-19 03:48:05.226193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c1a7f3b924'
+down_revision: Union[str, None] = 'd2f8b4a6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE status ADD VALUE IF NOT EXISTS 'SystemError'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop an enum value, and rebuilding the type would
+    # rewrite every submission partition, so the value is only left unused.
+    op.execute("UPDATE submission SET status = 'Pending' WHERE status = 'SystemError'")
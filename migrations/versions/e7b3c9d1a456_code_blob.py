@@ -0,0 +1,62 @@
+"""code blob
+
+Revision ID: e7b3c9d1a456
+Revises: 5f1c3e8a7b20
+Create Date: 2026-10-18 21:05:38.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c9d1a456'
+down_revision: Union[str, None] = '5f1c3e8a7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('code_dictionary',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_code_dictionary'))
+    )
+    op.create_table('code_blob',
+    sa.Column('hash', sa.LargeBinary(), nullable=False),
+    sa.Column('dictionary_id', sa.Integer(), nullable=True),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['dictionary_id'], ['code_dictionary.id'], name=op.f('fk_code_blob_dictionary_id_code_dictionary')),
+    sa.PrimaryKeyConstraint('hash', name=op.f('pk_code_blob'))
+    )
+    with op.batch_alter_table('user_solution', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('code_hash', sa.LargeBinary(), nullable=True))
+        batch_op.alter_column('code',
+               existing_type=sa.VARCHAR(),
+               nullable=True)
+    # NOT VALID skips checking existing rows, so this does not scan the
+    # table under lock; e8c4d0a2b567 validates it after the backfill.
+    op.execute(
+        'ALTER TABLE user_solution '
+        'ADD CONSTRAINT fk_user_solution_code_hash_code_blob '
+        'FOREIGN KEY (code_hash) REFERENCES code_blob (hash) NOT VALID'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_user_solution_code_hash_code_blob', 'user_solution', type_='foreignkey')
+    with op.batch_alter_table('user_solution', schema=None) as batch_op:
+        batch_op.alter_column('code',
+               existing_type=sa.VARCHAR(),
+               nullable=False)
+        batch_op.drop_column('code_hash')
+
+    op.drop_table('code_blob')
+    op.drop_table('code_dictionary')
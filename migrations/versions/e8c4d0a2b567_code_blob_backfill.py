@@ -0,0 +1,196 @@
+"""code blob backfill
+
+Revision ID: e8c4d0a2b567
+Revises: e7b3c9d1a456
+Create Date: 2026-10-18 21:06:12.417530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import zstandard
+
+from src.utils.code_blob import (
+    code_compressor,
+    code_decompressor,
+    code_hash,
+    train_dictionary,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c4d0a2b567'
+down_revision: Union[str, None] = 'e7b3c9d1a456'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+DICTIONARY_SIZE = 112640
+DICTIONARY_SAMPLES = 10000
+
+SELECT_BATCH = sa.text("""
+    SELECT id, code
+    FROM user_solution
+    WHERE id > :after AND code IS NOT NULL AND code_hash IS NULL
+    ORDER BY id
+    LIMIT :limit
+""").bindparams(sa.bindparam('after', type_=postgresql.UUID))
+
+INSERT_BLOBS = sa.text("""
+    INSERT INTO code_blob (hash, dictionary_id, data, size, created_at)
+    SELECT b.hash, b.dictionary_id, b.data, b.size, NOW()
+    FROM unnest(
+      CAST(:hashes AS bytea[]),
+      CAST(:dictionary_ids AS integer[]),
+      CAST(:data AS bytea[]),
+      CAST(:sizes AS integer[])
+    ) AS b(hash, dictionary_id, data, size)
+    ON CONFLICT DO NOTHING
+""").bindparams(
+    sa.bindparam('hashes', type_=postgresql.ARRAY(sa.LargeBinary)),
+    sa.bindparam('dictionary_ids', type_=postgresql.ARRAY(sa.Integer)),
+    sa.bindparam('data', type_=postgresql.ARRAY(sa.LargeBinary)),
+    sa.bindparam('sizes', type_=postgresql.ARRAY(sa.Integer)),
+)
+
+# Rows are only touched if still unconverted, so a rerun after an
+# interruption picks up where it stopped.
+UPDATE_BATCH = sa.text("""
+    UPDATE user_solution u
+    SET code_hash = v.hash, code = NULL
+    FROM unnest(
+      CAST(:ids AS uuid[]),
+      CAST(:hashes AS bytea[])
+    ) AS v(id, hash)
+    WHERE u.id = v.id AND u.code_hash IS NULL
+""").bindparams(
+    sa.bindparam('ids', type_=postgresql.ARRAY(postgresql.UUID)),
+    sa.bindparam('hashes', type_=postgresql.ARRAY(sa.LargeBinary)),
+)
+
+SELECT_RESTORE_BATCH = sa.text("""
+    SELECT u.id, cb.dictionary_id, cb.data
+    FROM user_solution u
+    JOIN code_blob cb ON cb.hash = u.code_hash
+    WHERE u.id > :after AND u.code IS NULL
+    ORDER BY u.id
+    LIMIT :limit
+""").bindparams(sa.bindparam('after', type_=postgresql.UUID))
+
+RESTORE_BATCH = sa.text("""
+    UPDATE user_solution u
+    SET code = v.code, code_hash = NULL
+    FROM unnest(
+      CAST(:ids AS uuid[]),
+      CAST(:codes AS varchar[])
+    ) AS v(id, code)
+    WHERE u.id = v.id
+""").bindparams(
+    sa.bindparam('ids', type_=postgresql.ARRAY(postgresql.UUID)),
+    sa.bindparam('codes', type_=postgresql.ARRAY(sa.String)),
+)
+
+MIN_UUID = '00000000-0000-0000-0000-000000000000'
+
+
+def _dictionary(bind) -> tuple[int, bytes] | None:
+    # A rerun after an interruption keeps compressing with the dictionary
+    # the first run trained.
+    latest = bind.execute(sa.text(
+        'SELECT id, data FROM code_dictionary ORDER BY id DESC LIMIT 1'
+    )).one_or_none()
+    if latest is not None:
+        return tuple(latest)
+
+    samples = bind.execute(sa.text("""
+        SELECT code
+        FROM user_solution
+        WHERE code IS NOT NULL
+        ORDER BY created_at DESC
+        LIMIT :limit
+    """), {'limit': DICTIONARY_SAMPLES}).scalars().all()
+    try:
+        data = train_dictionary(samples, DICTIONARY_SIZE)
+    except zstandard.ZstdError:
+        # Too little code to learn from yet; blobs are written without a
+        # dictionary until one is trained with train_code_dictionary.
+        return None
+
+    dictionary_id = bind.execute(
+        sa.text(
+            "INSERT INTO code_dictionary (data, created_at) "
+            "VALUES (:data, NOW()) RETURNING id"
+        ).bindparams(sa.bindparam('data', type_=sa.LargeBinary)),
+        {'data': data},
+    ).scalar_one()
+    return dictionary_id, data
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    dictionary = _dictionary(bind)
+    dictionary_id, compressor = (
+        (dictionary[0], code_compressor(dictionary[1]))
+        if dictionary
+        else (None, code_compressor())
+    )
+
+    # Each batch commits on its own and only row locks are taken, so
+    # submissions keep flowing while existing code is converted.
+    with op.get_context().autocommit_block():
+        after = MIN_UUID
+        while rows := bind.execute(
+            SELECT_BATCH, {'after': after, 'limit': BATCH_SIZE}
+        ).all():
+            blobs = {}
+            hashes = []
+            for _, code in rows:
+                digest = code_hash(code)
+                hashes.append(digest)
+                if digest not in blobs:
+                    raw = code.encode('utf-8')
+                    blobs[digest] = (compressor.compress(raw), len(raw))
+
+            bind.execute(INSERT_BLOBS, {
+                'hashes': list(blobs),
+                'dictionary_ids': [dictionary_id] * len(blobs),
+                'data': [data for data, _ in blobs.values()],
+                'sizes': [size for _, size in blobs.values()],
+            })
+            bind.execute(UPDATE_BATCH, {
+                'ids': [id for id, _ in rows],
+                'hashes': hashes,
+            })
+            after = rows[-1][0]
+
+    op.execute(
+        'ALTER TABLE user_solution '
+        'VALIDATE CONSTRAINT fk_user_solution_code_hash_code_blob'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    decompressors = {None: code_decompressor()}
+    for dictionary_id, data in bind.execute(
+        sa.text('SELECT id, data FROM code_dictionary')
+    ):
+        decompressors[dictionary_id] = code_decompressor(data)
+
+    with op.get_context().autocommit_block():
+        after = MIN_UUID
+        while rows := bind.execute(
+            SELECT_RESTORE_BATCH, {'after': after, 'limit': BATCH_SIZE}
+        ).all():
+            bind.execute(RESTORE_BATCH, {
+                'ids': [id for id, _, _ in rows],
+                'codes': [
+                    decompressors[dictionary_id].decompress(data).decode('utf-8')
+                    for _, dictionary_id, data in rows
+                ],
+            })
+            after = rows[-1][0]
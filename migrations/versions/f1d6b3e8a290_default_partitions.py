@@ -0,0 +1,41 @@
+"""default partitions
+
+Revision ID: f1d6b3e8a290
+Revises: e5c1a7f3b924
+Create Date: 2026-10-19 05:12:40.318846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d6b3e8a290'
+down_revision: Union[str, None] = 'e5c1a7f3b924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Named here rather than taken from src.utils.partitions, which may change.
+PARTITIONED_TABLES = ('user_solution', 'submission')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows for a month without its own partition land here instead of
+    # failing to insert.
+    for table in PARTITIONED_TABLES:
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for table in reversed(PARTITIONED_TABLES):
+        if bind.execute(sa.text(f'SELECT EXISTS (SELECT 1 FROM {table}_default)')).scalar():
+            raise Exception(
+                f'{table}_default has rows; move them to monthly partitions first'
+            )
+        op.execute(f'ALTER TABLE {table} DETACH PARTITION {table}_default')
+        op.execute(f'DROP TABLE {table}_default')
@@ -0,0 +1,41 @@
+"""judge statuses
+
+Revision ID: f3a9d2c6b871
+Revises: e8c4d0a2b567
+Create Date: 2026-10-18 22:14:51.620385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9d2c6b871'
+down_revision: Union[str, None] = 'e8c4d0a2b567'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE status ADD VALUE IF NOT EXISTS 'MemoryLimit'")
+    op.execute("ALTER TYPE status ADD VALUE IF NOT EXISTS 'RuntimeError'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres cannot drop enum values, so the type is rebuilt without them.
+    op.execute(
+        "UPDATE submission SET status = 'Rejected' "
+        "WHERE status IN ('MemoryLimit', 'RuntimeError')"
+    )
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_user_id_accepted', postgresql_where=sa.text("status = 'Accepted'"))
+    op.execute("ALTER TYPE status RENAME TO status_old")
+    op.execute("CREATE TYPE status AS ENUM ('Accepted', 'Rejected', 'Pending', 'TimeLimit')")
+    op.execute("ALTER TABLE submission ALTER COLUMN status TYPE status USING status::text::status")
+    op.execute("DROP TYPE status_old")
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.create_index('ix_submission_user_id_accepted', ['user_id', 'problem_id'], unique=False, postgresql_where=sa.text("status = 'Accepted'"))
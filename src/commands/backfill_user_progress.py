@@ -0,0 +1,96 @@
+"""Rebuild user_progress from solved problems and accepted submissions.
+
+python -m src.commands.backfill_user_progress
+
+Totals and monthly counts come from solved_problem. Streaks come from the
+days with an accepted submission, so months archived by manage_partitions
+no longer count towards them.
+"""
+
+import argparse
+import asyncio
+from sqlalchemy import text
+from src.core.db import sessionmanager
+
+BACKFILL_SQL = text("""
+    WITH months AS (
+      SELECT user_id, to_char(solved_at AT TIME ZONE 'UTC', 'YYYY-MM') AS month,
+             COUNT(*)::int AS solved
+      FROM solved_problem
+      GROUP BY 1, 2
+    ),
+    solved AS (
+      SELECT user_id, SUM(solved)::int AS total_solved,
+             jsonb_object_agg(month, solved) AS monthly_solved
+      FROM months
+      GROUP BY user_id
+    ),
+    days AS (
+      SELECT DISTINCT user_id, (created_at AT TIME ZONE 'UTC')::date AS day
+      FROM submission
+      WHERE status = 'Accepted'
+    ),
+    runs AS (
+      -- Consecutive days share day - row_number.
+      SELECT user_id, COUNT(*)::int AS length, MAX(day) AS last_day
+      FROM (
+        SELECT user_id, day,
+               day - (ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY day))::int
+                 AS run
+        FROM days
+      ) d
+      GROUP BY user_id, run
+    ),
+    streaks AS (
+      SELECT user_id,
+             (ARRAY_AGG(length ORDER BY last_day DESC))[1] AS current_streak,
+             MAX(length) AS longest_streak,
+             MAX(last_day) AS last_solved_on
+      FROM runs
+      GROUP BY user_id
+    )
+    INSERT INTO user_progress (
+      user_id, total_solved, monthly_solved,
+      current_streak, longest_streak, last_solved_on, updated_at
+    )
+    SELECT
+      COALESCE(so.user_id, st.user_id),
+      COALESCE(so.total_solved, 0),
+      COALESCE(so.monthly_solved, '{}'),
+      COALESCE(st.current_streak, 0),
+      COALESCE(st.longest_streak, 0),
+      st.last_solved_on,
+      NOW()
+    FROM solved so
+    FULL JOIN streaks st ON st.user_id = so.user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET total_solved = EXCLUDED.total_solved,
+        monthly_solved = EXCLUDED.monthly_solved,
+        current_streak = EXCLUDED.current_streak,
+        longest_streak = EXCLUDED.longest_streak,
+        last_solved_on = EXCLUDED.last_solved_on,
+        updated_at = EXCLUDED.updated_at
+    """)
+
+
+async def backfill():
+    async with sessionmanager.session() as session:
+        async with session.begin():
+            # The progress triggers wait on this lock, so no solve lands
+            # between the rebuild's read and its write.
+            await session.execute(
+                text("LOCK TABLE user_progress IN SHARE ROW EXCLUSIVE MODE")
+            )
+            result = await session.execute(BACKFILL_SQL)
+            print(f"user_progress rebuilt for {result.rowcount} user(s)")
+
+    await sessionmanager.close()
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    asyncio.run(backfill())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Fail when a registered query would sequentially scan a large table.
+
+python -m src.commands.check_query_plans [--min-rows N] [--query NAME ...]
+
+Run against a seeded database. Each query is EXPLAINed, not executed, with
+parameters sampled from the data. Sequential scans are disabled while
+planning, so one that remains means no index can serve the query.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Iterator
+from uuid import uuid4
+from sqlalchemy import ARRAY, Enum, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TypeEngine
+from src.core.db import sessionmanager
+from src.queries import Query, queries
+
+# Real values for the parameters that select rows; the rest get a
+# placeholder of their type.
+SAMPLE_SQL = text("""
+    SELECT
+      s.id AS submission_id,
+      s.user_id,
+      s.problem_id,
+      s.problem_id AS pid,
+      p.name,
+      p.name AS problem_name,
+      us.code_hash,
+      (SELECT list_id FROM list_problem LIMIT 1) AS list_id,
+      (SELECT topic_id FROM topic_problem LIMIT 1) AS topic_id
+    FROM submission s
+    JOIN problem p ON p.id = s.problem_id
+    JOIN user_solution us
+      ON us.id = s.user_solution_id AND us.created_at = s.created_at
+    ORDER BY s.created_at DESC
+    LIMIT 1
+    """)
+
+FIXED_SAMPLES = {"status": "Accepted", "statuses": ["Accepted"]}
+
+# Plans scan partitions, so each is counted as its whole partitioned table.
+TABLE_ROWS_SQL = text("""
+    SELECT c.relname, root.relname, (
+      CASE WHEN root.relkind = 'p' THEN (
+        SELECT SUM(leaf.reltuples)
+        FROM pg_partition_tree(root.oid) t
+        JOIN pg_class leaf ON leaf.oid = t.relid
+        WHERE t.isleaf
+      ) ELSE root.reltuples END
+    )::bigint
+    FROM pg_class c
+    JOIN pg_class root ON root.oid = COALESCE(pg_partition_root(c.oid), c.oid)
+    WHERE c.relkind IN ('r', 'p')
+      AND c.relnamespace = current_schema()::regnamespace
+    """)
+
+PLACEHOLDERS = {
+    bool: False,
+    bytes: b"",
+    datetime: datetime.now(timezone.utc),
+    int: 1,
+    str: "",
+}
+
+
+def placeholder(type_: TypeEngine) -> Any:
+    if isinstance(type_, ARRAY):
+        return [placeholder(type_.item_type)]
+    if isinstance(type_, Enum):
+        return type_.enums[0]
+    python_type = type_.python_type
+    return PLACEHOLDERS[python_type] if python_type in PLACEHOLDERS else uuid4()
+
+
+def params_for(query: Query, samples: dict[str, Any]) -> dict[str, Any]:
+    return {
+        param.key: (
+            samples[param.key] if param.key in samples else placeholder(param.type)
+        )
+        for param in query.bindparams
+    }
+
+
+def seq_scans(plan: dict) -> Iterator[str]:
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from seq_scans(child)
+
+
+async def explain(session: AsyncSession, query: Query, params: dict) -> dict:
+    statement = text(f"EXPLAIN (FORMAT JSON) {query.sql}")
+    if query.bindparams:
+        statement = statement.bindparams(*query.bindparams)
+    result = await session.execute(statement, params)
+    return result.scalar_one()[0]["Plan"]
+
+
+async def check(min_rows: int, names: list[str] | None) -> int:
+    failures = 0
+    async with sessionmanager.session() as session:
+        async with session.begin():
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+            samples = (await session.execute(SAMPLE_SQL)).mappings().one_or_none()
+            if samples is None:
+                raise SystemExit("No submissions to sample; seed the database first")
+            samples = {**samples, **FIXED_SAMPLES}
+            # Tables never analyzed have no row estimate.
+            await session.execute(text("ANALYZE"))
+            tables = {
+                name: (table, rows)
+                for name, table, rows in await session.execute(TABLE_ROWS_SQL)
+            }
+
+            for query in queries:
+                if names and query.name not in names:
+                    continue
+
+                try:
+                    async with session.begin_nested():
+                        plan = await explain(session, query, params_for(query, samples))
+                except Exception as e:
+                    failures += 1
+                    print(f"FAIL {query.name}: {type(e).__name__}: {e}")
+                    continue
+
+                large = sorted(
+                    {
+                        tables[name]
+                        for name in seq_scans(plan)
+                        if name in tables and tables[name][1] >= min_rows
+                    }
+                )
+                if large:
+                    failures += 1
+                    scans = ", ".join(f"{t} ({rows} rows)" for t, rows in large)
+                    print(f"FAIL {query.name}: sequential scan of {scans}")
+                else:
+                    print(f"ok   {query.name}")
+
+            await session.rollback()
+
+    await sessionmanager.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=500,
+        help="tables with at least this many rows may not be scanned",
+    )
+    parser.add_argument(
+        "--query", action="append", help="check only this query; repeatable"
+    )
+    args = parser.parse_args()
+
+    failures = asyncio.run(check(args.min_rows, args.query))
+    print(f"{failures} query plan(s) failed")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
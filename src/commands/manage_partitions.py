@@ -0,0 +1,127 @@
+"""Create upcoming monthly partitions and archive old ones.
+
+python -m src.commands.manage_partitions [--ahead N] [--retain-months N]
+    [--drop] [--dry-run]
+
+The app creates partitions ahead on its own, every PARTITIONS_CHECK_SECONDS;
+rows for a month without one land in the default partition. Archived
+months are detached from both tables and moved, without their foreign
+keys, to the archive schema; --drop deletes them instead.
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, timezone
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.db import sessionmanager
+from src.core.partitions import (
+    PARTITIONS_AHEAD,
+    missing_partitions,
+    partition_months,
+)
+from src.utils.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    month_start,
+    partition_name,
+)
+
+ARCHIVE_SCHEMA = "archive"
+
+FOREIGN_KEYS_SQL = text("""
+    SELECT conname
+    FROM pg_constraint
+    WHERE conrelid = to_regclass(:table) AND contype = 'f'
+    """).bindparams(bindparam("table", type_=String))
+
+
+async def run(session: AsyncSession, sql: str, dry_run: bool):
+    print(f"{sql};")
+    if not dry_run:
+        await session.execute(text(sql))
+
+
+async def create_ahead(session: AsyncSession, ahead: int, dry_run: bool):
+    for statement in await missing_partitions(session, ahead):
+        await run(session, statement, dry_run)
+
+
+async def archive_month(session: AsyncSession, month: date, drop: bool, dry_run: bool):
+    # submission goes first: its rows reference user_solution's, and a
+    # partition can only be detached once nothing attached refers to it.
+    for table in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, month)
+        await run(session, f"ALTER TABLE {table} DETACH PARTITION {name}", dry_run)
+        if drop:
+            await run(session, f"DROP TABLE {name}", dry_run)
+            continue
+
+        # The keys would tie archived rows to live ones, e.g. blocking
+        # the deletion of a problem.
+        foreign_keys = await session.execute(FOREIGN_KEYS_SQL, {"table": name})
+        for constraint in foreign_keys.scalars().all():
+            await run(
+                session, f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"', dry_run
+            )
+        await run(session, f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}", dry_run)
+
+
+async def archive_before(
+    session: AsyncSession, retain_months: int, drop: bool, dry_run: bool
+):
+    current = month_start(datetime.now(timezone.utc).date())
+    cutoff = add_months(current, -retain_months)
+    months = [await partition_months(session, table) for table in PARTITIONED_TABLES]
+    cold = sorted(month for month in set.intersection(*months) if month < cutoff)
+    if cold and not drop:
+        await run(session, f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}", dry_run)
+
+    for month in cold:
+        await archive_month(session, month, drop, dry_run)
+        # Each month is its own transaction, so the detach locks are short.
+        if not dry_run:
+            await session.commit()
+    print(f"{len(cold)} month(s) {'dropped' if drop else 'archived'}")
+
+
+async def manage(ahead: int, retain_months: int | None, drop: bool, dry_run: bool):
+    async with sessionmanager.session() as session:
+        await create_ahead(session, ahead, dry_run)
+        if not dry_run:
+            await session.commit()
+
+        if retain_months is not None:
+            await archive_before(session, retain_months, drop, dry_run)
+
+    await sessionmanager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--ahead",
+        type=int,
+        default=PARTITIONS_AHEAD,
+        help="months past the current one to create",
+    )
+    parser.add_argument(
+        "--retain-months",
+        type=int,
+        help="archive months older than this many before the current one",
+    )
+    parser.add_argument(
+        "--drop", action="store_true", help="drop old months instead of archiving"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="print the statements only"
+    )
+    args = parser.parse_args()
+
+    if args.retain_months is not None and args.retain_months < 1:
+        parser.error("--retain-months must be at least 1")
+    asyncio.run(manage(args.ahead, args.retain_months, args.drop, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Recompute problem_stats from scratch and report drift.
+
+python -m src.commands.reconcile_problem_stats [--fix]
+"""
+
+import argparse
+import asyncio
+from sqlalchemy import text
+from src.core.db import sessionmanager
+
+EXPECTED_SQL = """
+    SELECT
+      p.id AS problem_id,
+      p.name,
+      (SELECT COUNT(*) FROM bookmark b WHERE b.problem_id = p.id)::int
+        AS bookmark_count,
+      -- solved_problem outlives the submissions that manage_partitions
+      -- archives, so solvers are counted there.
+      (SELECT COUNT(*) FROM solved_problem sp WHERE sp.problem_id = p.id)::int
+        AS solved_count
+    FROM problem p
+"""
+
+DRIFT_SQL = text(f"""
+    SELECT
+      e.problem_id,
+      e.name,
+      COALESCE(ps.bookmark_count, 0) AS bookmark_count,
+      e.bookmark_count AS expected_bookmark_count,
+      COALESCE(ps.solved_count, 0) AS solved_count,
+      e.solved_count AS expected_solved_count
+    FROM ({EXPECTED_SQL}) e
+    LEFT JOIN problem_stats ps ON ps.problem_id = e.problem_id
+    WHERE COALESCE(ps.bookmark_count, 0) <> e.bookmark_count
+       OR COALESCE(ps.solved_count, 0) <> e.solved_count
+    ORDER BY e.name
+    """)
+
+MISSING_SOLVED_SQL = text("""
+    INSERT INTO solved_problem (user_id, problem_id, solved_at)
+    SELECT user_id, problem_id, MIN(created_at)
+    FROM submission
+    WHERE status = 'Accepted'
+    GROUP BY user_id, problem_id
+    ON CONFLICT DO NOTHING
+    """)
+
+REBUILD_SQL = text(f"""
+    INSERT INTO problem_stats (problem_id, bookmark_count, solved_count)
+    SELECT problem_id, bookmark_count, solved_count
+    FROM ({EXPECTED_SQL}) e
+    ON CONFLICT (problem_id) DO UPDATE
+    SET bookmark_count = EXCLUDED.bookmark_count,
+        solved_count = EXCLUDED.solved_count
+    """)
+
+
+async def reconcile(fix: bool) -> int:
+    async with sessionmanager.session() as session:
+        async with session.begin():
+            if fix:
+                # Counter triggers wait on this lock, so no increment lands
+                # between the recount and the rewrite.
+                await session.execute(
+                    text("LOCK TABLE problem_stats IN SHARE ROW EXCLUSIVE MODE")
+                )
+
+            drift = (await session.execute(DRIFT_SQL)).mappings().all()
+            for row in drift:
+                print(
+                    f"{row['name']}: "
+                    f"bookmarks {row['bookmark_count']} -> "
+                    f"{row['expected_bookmark_count']}, "
+                    f"solvers {row['solved_count']} -> "
+                    f"{row['expected_solved_count']}"
+                )
+            print(f"{len(drift)} problem(s) drifted")
+
+            if fix:
+                missing = await session.execute(MISSING_SOLVED_SQL)
+                print(f"{missing.rowcount} missing solved_problem row(s) added")
+                await session.execute(REBUILD_SQL)
+                print("problem_stats rebuilt")
+
+    await sessionmanager.close()
+    return len(drift)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--fix", action="store_true", help="rewrite the counters after reporting"
+    )
+    args = parser.parse_args()
+
+    drifted = asyncio.run(reconcile(args.fix))
+    raise SystemExit(1 if drifted and not args.fix else 0)
+
+
+if __name__ == "__main__":
+    main()
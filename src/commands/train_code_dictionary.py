@@ -0,0 +1,68 @@
+"""Train a zstd dictionary on recent submissions for new code blobs.
+
+python -m src.commands.train_code_dictionary [--samples N] [--size BYTES]
+
+Workers pick the new dictionary up when they next start; blobs already
+written keep the dictionary they were compressed with.
+"""
+
+import argparse
+import asyncio
+from sqlalchemy import LargeBinary, bindparam, text
+from src.core.code_store import CodeStore
+from src.core.db import sessionmanager
+from src.utils.code_blob import code_compressor, train_dictionary
+
+SAMPLES_SQL = text("""
+    SELECT us.code, cb.dictionary_id AS code_dictionary_id, cb.data AS code_data
+    FROM user_solution us
+    LEFT JOIN code_blob cb ON cb.hash = us.code_hash
+    ORDER BY us.created_at DESC
+    LIMIT :limit
+    """)
+
+INSERT_SQL = text("""
+    INSERT INTO code_dictionary (data, created_at)
+    VALUES (:data, NOW())
+    RETURNING id
+    """).bindparams(bindparam("data", type_=LargeBinary))
+
+
+async def train(samples: int, size: int):
+    store = CodeStore()
+    async with sessionmanager.session() as session:
+        await store.load(session)
+        rows = (await session.execute(SAMPLES_SQL, {"limit": samples})).mappings()
+        codes = [(await store.with_code(session, row))["code"] for row in rows]
+        print(f"{len(codes)} sample(s) read")
+
+        dictionary = train_dictionary(codes, size)
+        new = code_compressor(dictionary)
+        raw = sum(len(code.encode("utf-8")) for code in codes)
+        current = sum(len(store.encode(code).data) for code in codes)
+        trained = sum(len(new.compress(code.encode("utf-8"))) for code in codes)
+        print(f"{raw} bytes of code: {current} compressed now, {trained} with this")
+
+        result = await session.execute(INSERT_SQL, {"data": dictionary})
+        dictionary_id = result.scalar_one()
+        await session.commit()
+        print(f"code_dictionary {dictionary_id} stored ({len(dictionary)} bytes)")
+
+    await sessionmanager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--samples", type=int, default=10000, help="most recent solutions to use"
+    )
+    parser.add_argument(
+        "--size", type=int, default=112640, help="dictionary size in bytes"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(train(args.samples, args.size))
+
+
+if __name__ == "__main__":
+    main()
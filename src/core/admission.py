@@ -0,0 +1,167 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Hashable
+from src.core.db import DATABASE_POOL_SIZE
+from src.utils.cache import TTLCache
+
+# Token buckets per route: a sustained rate per second and a burst. A rate
+# of 0 turns the limit off.
+SUBMISSION_RATE_LIMIT_PER_SECOND = float(
+    os.environ.get("SUBMISSION_RATE_LIMIT_PER_SECOND", 1)
+)
+SUBMISSION_RATE_LIMIT_BURST = int(os.environ.get("SUBMISSION_RATE_LIMIT_BURST", 10))
+SIGNIN_RATE_LIMIT_PER_SECOND = float(os.environ.get("SIGNIN_RATE_LIMIT_PER_SECOND", 1))
+SIGNIN_RATE_LIMIT_BURST = int(os.environ.get("SIGNIN_RATE_LIMIT_BURST", 20))
+
+# Writes may hold this many pooled connections at once; the rest of the
+# pool is left to reads.
+WRITE_GATE_LIMIT = int(
+    os.environ.get("WRITE_GATE_LIMIT", max(DATABASE_POOL_SIZE - 2, 1))
+)
+WRITE_GATE_MAX_WAIT_MS = int(os.environ.get("WRITE_GATE_MAX_WAIT_MS", 500))
+WRITE_GATE_MAX_WAITING = int(os.environ.get("WRITE_GATE_MAX_WAITING", 64))
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Overloaded, retry after {retry_after:.3f}s")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """Token bucket per key, e.g. per user.
+
+    An idle bucket refills to `burst` and is then forgotten, since a missing
+    bucket counts as full.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, maxsize: int = 65536):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.allowed = 0
+        self.limited = 0
+        self._buckets = TTLCache(maxsize)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def take(self, key: Hashable) -> float:
+        """Takes a token; returns 0, or the seconds until one is available."""
+        if not self.enabled:
+            return 0.0
+
+        now = time.time()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = self.burst
+        else:
+            tokens, updated_at = bucket
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+        if tokens < 1:
+            self.limited += 1
+            return (1 - tokens) / self.rate
+
+        tokens -= 1
+        self.allowed += 1
+        self._buckets.set(key, (tokens, now), now + (self.burst - tokens) / self.rate)
+        return 0.0
+
+    def stats(self) -> dict:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "tracked_keys": len(self._buckets),
+        }
+
+
+class AdmissionGate:
+    """Caps concurrent requests and sheds the excess instead of queueing it.
+
+    A request past the cap waits at most `max_wait` seconds for a slot, and
+    only `max_waiting` requests wait at all; the others are rejected at once.
+    """
+
+    def __init__(self, name: str, limit: int, max_wait: float, max_waiting: int):
+        self.name = name
+        self.limit = limit
+        self.max_wait = max_wait
+        self.max_waiting = max_waiting
+        self.in_use = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(limit)
+        self._waits: deque[float] = deque(maxlen=1024)
+
+    @property
+    def retry_after(self) -> int:
+        return max(math.ceil(self.max_wait), 1)
+
+    async def acquire(self):
+        if self._semaphore.locked():
+            if self.waiting >= self.max_waiting:
+                self.rejected += 1
+                raise Overloaded(self.retry_after)
+
+            started = time.monotonic()
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+            except TimeoutError:
+                self.rejected += 1
+                raise Overloaded(self.retry_after)
+            finally:
+                self.waiting -= 1
+            self._waits.append((time.monotonic() - started) * 1000)
+        else:
+            await self._semaphore.acquire()
+            self._waits.append(0.0)
+
+        self.in_use += 1
+        self.admitted += 1
+
+    def release(self):
+        self.in_use -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        return {
+            "limit": self.limit,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "max_wait_ms": self.max_wait * 1000,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_p95_ms": round(waits[int(len(waits) * 0.95)], 3) if waits else None,
+        }
+
+
+submission_limiter = RateLimiter(
+    "submission", SUBMISSION_RATE_LIMIT_PER_SECOND, SUBMISSION_RATE_LIMIT_BURST
+)
+signin_limiter = RateLimiter(
+    "signin", SIGNIN_RATE_LIMIT_PER_SECOND, SIGNIN_RATE_LIMIT_BURST
+)
+write_gate = AdmissionGate(
+    "write", WRITE_GATE_LIMIT, WRITE_GATE_MAX_WAIT_MS / 1000, WRITE_GATE_MAX_WAITING
+)
+
+
+def admission_stats() -> dict:
+    return {
+        "rate_limits": {
+            limiter.name: limiter.stats()
+            for limiter in (submission_limiter, signin_limiter)
+        },
+        "write_gate": write_gate.stats(),
+    }
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import os
+import time
+from typing import NamedTuple
+from uuid import UUID, uuid4
+from sqlalchemy.exc import DataError, IntegrityError
+from src.core.code_store import code_store
+from src.core.db import sessionmanager
+from src.models.enum import Status
+from src.queries import queries
+from src.schemas.submission import SubmissionBody
+
+logger = logging.getLogger(__name__)
+
+SUBMISSION_BATCHING = os.environ.get("SUBMISSION_BATCHING", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SUBMISSION_BATCH_MAX_SIZE = int(os.environ.get("SUBMISSION_BATCH_MAX_SIZE", 256))
+SUBMISSION_BATCH_MAX_DELAY_MS = float(
+    os.environ.get("SUBMISSION_BATCH_MAX_DELAY_MS", 5)
+)
+
+
+class SubmissionIds(NamedTuple):
+    solution_id: UUID
+    submission_id: UUID
+
+
+class _QueuedSubmission(NamedTuple):
+    user_id: UUID
+    body: SubmissionBody
+    ids: SubmissionIds
+    future: asyncio.Future
+
+
+class SubmissionBatcher:
+    """Group-commits submissions written by concurrent requests.
+
+    Queued submissions are written every max_delay seconds, or as soon as
+    max_size are waiting, as multi-row inserts in a single transaction.
+    Callers are only answered once that transaction has committed.
+    """
+
+    def __init__(self, max_size: int = 256, max_delay: float = 0.005):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.running = False
+        self.batches = 0
+        self.submissions = 0
+        self.largest_batch = 0
+        self.failed_batches = 0
+        self.total_time = 0.0
+        self._collecting: list[_QueuedSubmission] = []
+        self._queue: asyncio.Queue[_QueuedSubmission] = asyncio.Queue(
+            maxsize=max_size * 8
+        )
+
+    async def submit(self, user_id: UUID, body: SubmissionBody) -> SubmissionIds:
+        if not self.running:
+            raise Exception("SubmissionBatcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        ids = SubmissionIds(uuid4(), uuid4())
+        # Blocks once the queue is full, which pushes back on callers
+        # instead of growing without bound.
+        await self._queue.put(_QueuedSubmission(user_id, body, ids, future))
+        return await future
+
+    async def run(self):
+        self.running = True
+        flush = None
+        try:
+            while True:
+                batch = await self._collect()
+                # A write in progress is never abandoned half way, even when
+                # the app is shutting down.
+                flush = asyncio.ensure_future(self._flush(batch))
+                await asyncio.shield(flush)
+        finally:
+            self.running = False
+            if flush is not None:
+                await flush
+            await self._drain()
+
+    async def _collect(self) -> list[_QueuedSubmission]:
+        # Kept on self so a shutdown mid-collection can still write them.
+        self._collecting = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(self._collecting) < self.max_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                break
+            self._collecting.append(item)
+        batch, self._collecting = self._collecting, []
+        return batch
+
+    async def _drain(self):
+        # On shutdown, whatever is still queued is written before the
+        # engine goes away rather than dropped with its callers waiting.
+        batch, self._collecting = self._collecting, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_QueuedSubmission]):
+        # Callers that gave up before their submission was picked up are
+        # not written, as with a request cancelled before it reached the DB.
+        batch = [item for item in batch if not item.future.done()]
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            await self._write_isolating_failures(batch)
+        finally:
+            self.batches += 1
+            self.submissions += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.total_time += time.perf_counter() - start
+
+    async def _write_isolating_failures(self, batch: list[_QueuedSubmission]):
+        try:
+            await self._write(batch)
+        except (IntegrityError, DataError) as e:
+            # One bad row, e.g. an unknown problem_id, must not fail everyone
+            # else's submission: split the batch until only it is left.
+            if len(batch) == 1:
+                _set_exception(batch[0].future, e)
+                return
+            logger.warning("Submission batch of %d failed, splitting", len(batch))
+            self.failed_batches += 1
+            middle = len(batch) // 2
+            await self._write_isolating_failures(batch[:middle])
+            await self._write_isolating_failures(batch[middle:])
+        except Exception as e:
+            # Connection and operational errors are not about any one row;
+            # retrying halves would only repeat them.
+            self.failed_batches += 1
+            for item in batch:
+                _set_exception(item.future, e)
+        else:
+            for item in batch:
+                _set_result(item.future, item.ids)
+
+    async def _write(self, batch: list[_QueuedSubmission]):
+        statuses = [
+            item.body.status if item.body.status is not None else Status.Accepted
+            for item in batch
+        ]
+        user_ids = [item.user_id for item in batch]
+        problem_ids = [item.body.problem_id for item in batch]
+        solution_ids = [item.ids.solution_id for item in batch]
+        codes = [code_store.encode(item.body.code) for item in batch]
+        # Resubmissions of the same code share one blob.
+        blobs = list({code.hash: code for code in codes}.values())
+
+        async with sessionmanager.session() as session:
+            await queries.execute(
+                session,
+                "user.insert_code_blobs",
+                {
+                    "hashes": [blob.hash for blob in blobs],
+                    "dictionary_ids": [blob.dictionary_id for blob in blobs],
+                    "data": [blob.data for blob in blobs],
+                    "sizes": [blob.size for blob in blobs],
+                },
+            )
+            await queries.execute(
+                session,
+                "user.insert_user_solutions",
+                {
+                    "ids": solution_ids,
+                    "code_hashes": [code.hash for code in codes],
+                    "has_solved": [
+                        status != Status.Pending
+                        and item.body.total_testcases == item.body.passed_testcases
+                        for item, status in zip(batch, statuses)
+                    ],
+                    "user_ids": user_ids,
+                    "problem_ids": problem_ids,
+                },
+            )
+            await queries.execute(
+                session,
+                "user.insert_submissions",
+                {
+                    "ids": [item.ids.submission_id for item in batch],
+                    "statuses": [status.value for status in statuses],
+                    "user_ids": user_ids,
+                    "problem_ids": problem_ids,
+                    "user_solution_ids": solution_ids,
+                    "passed_testcases": [item.body.passed_testcases for item in batch],
+                    "total_testcases": [item.body.total_testcases for item in batch],
+                },
+            )
+
+            solved = [
+                (user_id, problem_id)
+                for user_id, problem_id, status in zip(user_ids, problem_ids, statuses)
+                if status == Status.Accepted
+            ]
+            if solved:
+                await queries.execute(
+                    session,
+                    "user.record_solved_many",
+                    {
+                        "user_ids": [user_id for user_id, _ in solved],
+                        "problem_ids": [problem_id for _, problem_id in solved],
+                    },
+                )
+
+            await session.commit()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": SUBMISSION_BATCHING,
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "submissions": self.submissions,
+            "mean_batch_size": (
+                round(self.submissions / self.batches, 2) if self.batches else None
+            ),
+            "largest_batch": self.largest_batch,
+            "failed_batches": self.failed_batches,
+            "mean_flush_ms": (
+                round(self.total_time * 1000 / self.batches, 3)
+                if self.batches
+                else None
+            ),
+        }
+
+
+def _set_result(future: asyncio.Future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+def _set_exception(future: asyncio.Future, exc: Exception):
+    if not future.done():
+        future.set_exception(exc)
+
+
+submission_batcher = SubmissionBatcher(
+    max_size=SUBMISSION_BATCH_MAX_SIZE,
+    max_delay=SUBMISSION_BATCH_MAX_DELAY_MS / 1000,
+)
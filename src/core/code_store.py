@@ -0,0 +1,68 @@
+from collections.abc import Mapping
+from typing import NamedTuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.queries import queries
+from src.utils.code_blob import code_compressor, code_decompressor, code_hash
+
+
+class EncodedCode(NamedTuple):
+    hash: bytes
+    dictionary_id: int | None
+    data: bytes
+    size: int
+
+
+class CodeStore:
+    """Compresses submitted code into code_blob rows and reads it back.
+
+    New blobs use the newest trained dictionary. Every dictionary is kept,
+    so blobs written under older ones stay readable.
+    """
+
+    def __init__(self):
+        self.dictionary_id: int | None = None
+        self._compressor = code_compressor()
+        self._decompressors = {None: code_decompressor()}
+
+    async def load(self, session: AsyncSession):
+        result = await queries.execute(session, "user.code_dictionaries")
+        latest = None
+        for dictionary_id, data in result:
+            if dictionary_id not in self._decompressors:
+                self._decompressors[dictionary_id] = code_decompressor(data)
+            latest = (dictionary_id, data)
+
+        if latest is not None and latest[0] != self.dictionary_id:
+            self.dictionary_id = latest[0]
+            self._compressor = code_compressor(latest[1])
+
+    def encode(self, code: str) -> EncodedCode:
+        raw = code.encode("utf-8")
+        return EncodedCode(
+            code_hash(code),
+            self.dictionary_id,
+            self._compressor.compress(raw),
+            len(raw),
+        )
+
+    async def decode(
+        self, session: AsyncSession, dictionary_id: int | None, data: bytes
+    ) -> str:
+        decompressor = self._decompressors.get(dictionary_id)
+        if decompressor is None:
+            # Trained after this worker last loaded its dictionaries.
+            await self.load(session)
+            decompressor = self._decompressors[dictionary_id]
+        return decompressor.decompress(data).decode("utf-8")
+
+    async def with_code(self, session: AsyncSession, row: Mapping) -> dict:
+        """Replaces a row's code_dictionary_id/code_data with its code."""
+        row = dict(row)
+        dictionary_id = row.pop("code_dictionary_id")
+        data = row.pop("code_data")
+        if data is not None:
+            row["code"] = await self.decode(session, dictionary_id, data)
+        return row
+
+
+code_store = CodeStore()
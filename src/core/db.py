@@ -1,15 +1,23 @@
+import asyncio
 import contextlib
+import logging
 import os
+import time
 from typing import Any, AsyncIterator
 from dotenv import load_dotenv
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -26,19 +34,64 @@ class Base(DeclarativeBase):
 
 load_dotenv()
 
+DATABASE_POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", 10))
+# How long a request waits for a pooled connection before giving up.
+DATABASE_POOL_TIMEOUT_SECONDS = float(
+    os.environ.get("DATABASE_POOL_TIMEOUT_SECONDS", 30)
+)
+
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+      WHEN NOT pg_is_in_recovery() THEN 0
+      WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+      ELSE COALESCE(
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+      )
+    END
+    """)
+
+
+class Replica:
+    def __init__(self, host: str, engine_kwargs: dict[str, Any]):
+        self.engine: AsyncEngine = create_async_engine(host, **engine_kwargs)
+        self.sessionmaker = async_sessionmaker(autocommit=False, bind=self.engine)
+        self.healthy = False
+        self.lag: float | None = None
+
+    def stats(self) -> dict:
+        return {
+            "host": self.engine.url.render_as_string(hide_password=True),
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+        }
+
 
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        replica_hosts: list[str] | None = None,
+        max_replica_lag: float = 5.0,
+    ):
         self._engine = create_async_engine(host, **engine_kwargs)
         self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
+        self._replicas = [Replica(h, engine_kwargs) for h in replica_hosts or []]
+        self._next_replica = 0
+        self._max_replica_lag = max_replica_lag
+        # Users who just wrote read from the primary until replicas catch up.
+        self._pinned_users = TTLCache(maxsize=16384)
 
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._replicas = []
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -66,15 +119,105 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @contextlib.asynccontextmanager
+    async def read_session(
+        self, user_id: str | None = None
+    ) -> AsyncIterator[AsyncSession]:
+        replica = self._pick_replica(user_id)
+        if replica is None:
+            async with self.session() as session:
+                yield session
+            return
+
+        session = replica.sessionmaker()
+        try:
+            yield session
+        except DBAPIError as e:
+            await session.rollback()
+            if e.connection_invalidated:
+                replica.healthy = False
+            raise
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    def _pick_replica(self, user_id: str | None) -> Replica | None:
+        if user_id is not None and self._pinned_users.get(str(user_id)):
+            return None
+
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[self._next_replica]
+            self._next_replica = (self._next_replica + 1) % len(self._replicas)
+            if replica.healthy:
+                return replica
+
+        return None
+
+    def pin_to_primary(self, user_id: str, seconds: float | None = None):
+        seconds = seconds if seconds is not None else self._max_replica_lag * 2
+        self._pinned_users.set(str(user_id), True, time.time() + seconds)
+
+    async def check_replicas(self):
+        for replica in self._replicas:
+            try:
+                async with replica.engine.connect() as connection:
+                    lag = (await connection.execute(REPLICA_LAG_SQL)).scalar()
+                replica.lag = float(lag)
+                replica.healthy = replica.lag <= self._max_replica_lag
+            except Exception:
+                logger.warning("Replica health check failed", exc_info=True)
+                replica.lag = None
+                replica.healthy = False
+
+    async def monitor_replicas(self, interval: float = 2.0):
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(interval)
+
+    @property
+    def engine(self) -> AsyncEngine | None:
+        return self._engine
+
+    @property
+    def replica_engines(self) -> list[AsyncEngine]:
+        return [replica.engine for replica in self._replicas]
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def replica_stats(self) -> list[dict]:
+        return [replica.stats() for replica in self._replicas]
+
+    def pool_stats(self) -> dict | None:
+        if self._engine is None:
+            return None
+        pool = self._engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "timeout_seconds": pool.timeout(),
+        }
+
 
 sessionmanager = DatabaseSessionManager(
     os.environ["DATABASE_URL"],
     engine_kwargs={
-        "pool_size": 10,
+        "pool_size": DATABASE_POOL_SIZE,
+        "pool_timeout": DATABASE_POOL_TIMEOUT_SECONDS,
         "pool_pre_ping": True,
         "max_overflow": 0,
         "future": True,
     },
+    replica_hosts=[
+        url.strip()
+        for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ],
+    max_replica_lag=float(os.environ.get("DATABASE_REPLICA_MAX_LAG_SECONDS", 5)),
 )
 
 
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import logging
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.db import sessionmanager
+from src.queries import queries
+from src.utils.catalog import CATALOG_CHANNEL, CatalogCache, catalog_cache
+
+logger = logging.getLogger(__name__)
+
+CURRENT_VERSION_SQL = """
+    SELECT CASE WHEN is_called THEN last_value ELSE 0 END
+    FROM catalog_version_seq
+"""
+
+
+async def publish_catalog_change(
+    session: AsyncSession, entity: str, entity_id: str
+) -> int:
+    # NOTIFY is transactional: other workers only hear about the change once
+    # the caller commits, and never if it rolls back.
+    result = await queries.execute(
+        session,
+        "admin.notify_catalog_change",
+        {"entity": entity, "entity_id": str(entity_id)},
+    )
+    return result.scalar_one()
+
+
+class CatalogInvalidationListener:
+    """Keeps this worker's catalog cache in step with admin writes elsewhere.
+
+    Holds one dedicated connection LISTENing on the catalog channel. Whenever
+    that connection is (re)established the cache is flushed, since anything
+    published while it was down was missed.
+    """
+
+    def __init__(
+        self,
+        cache: CatalogCache,
+        channel: str = CATALOG_CHANNEL,
+        keepalive: float = 10.0,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ):
+        self.channel = channel
+        self.connected = False
+        self.notifications = 0
+        self.gaps = 0
+        self.reconnects = 0
+        self._cache = cache
+        self._keepalive = keepalive
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+
+    async def run(self):
+        retry_delay = self._retry_delay
+        while True:
+            try:
+                await self._listen()
+            except Exception as e:
+                logger.warning("Catalog listener disconnected: %r", e)
+
+            if self.connected:
+                retry_delay = self._retry_delay
+            self.connected = False
+            self._cache.flush()
+            self.reconnects += 1
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, self._max_retry_delay)
+
+    async def _listen(self):
+        dsn = sessionmanager.engine.url.set(drivername="postgresql")
+        connection = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        try:
+            await connection.add_listener(self.channel, self._on_notify)
+            version = await connection.fetchval(CURRENT_VERSION_SQL)
+            self._cache.flush(version)
+            self.connected = True
+
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), self._keepalive)
+                except TimeoutError:
+                    # Catches half-open connections that never report closing.
+                    await asyncio.wait_for(connection.fetchval("SELECT 1"), 5)
+        finally:
+            if not connection.is_closed():
+                await connection.close(timeout=5)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.notifications += 1
+        try:
+            version = int(json.loads(payload)["version"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed catalog notification: %r", payload)
+            self._cache.flush()
+            return
+
+        # Sequence values burnt by rolled-back writes also show up as gaps;
+        # either way the whole catalog cache is dropped.
+        if version > self._cache.version + 1:
+            self.gaps += 1
+        self._cache.advance(version)
+
+    def stats(self) -> dict:
+        return {
+            "channel": self.channel,
+            "connected": self.connected,
+            "notifications": self.notifications,
+            "gaps": self.gaps,
+            "reconnects": self.reconnects,
+        }
+
+
+catalog_listener = CatalogInvalidationListener(catalog_cache)
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timezone
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.db import sessionmanager
+from src.utils.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition_sql,
+    default_partition_name,
+    month_start,
+    partition_month,
+)
+
+logger = logging.getLogger(__name__)
+
+# Months past the current one that always have a partition.
+PARTITIONS_AHEAD = int(os.environ.get("PARTITIONS_AHEAD", 3))
+PARTITIONS_CHECK_SECONDS = float(os.environ.get("PARTITIONS_CHECK_SECONDS", 3600))
+
+PARTITIONS_SQL = text("""
+    SELECT child.relname
+    FROM pg_inherits i
+    JOIN pg_class parent ON parent.oid = i.inhparent
+    JOIN pg_class child ON child.oid = i.inhrelid
+    WHERE parent.oid = to_regclass(:table)
+    """).bindparams(bindparam("table", type_=String))
+
+# Every worker and the manage_partitions command take this lock, so only
+# one of them creates a given month.
+LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('partitions'))")
+
+
+async def partition_months(session: AsyncSession, table: str) -> set[date]:
+    rows = await session.execute(PARTITIONS_SQL, {"table": table})
+    months = (partition_month(table, name) for name in rows.scalars())
+    return {month for month in months if month is not None}
+
+
+async def in_default_partition(session: AsyncSession, table: str, month: date) -> bool:
+    result = await session.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {default_partition_name(table)} "
+            "WHERE created_at >= :start AND created_at < :end)"
+        ),
+        {"start": month, "end": add_months(month, 1)},
+    )
+    return result.scalar_one()
+
+
+async def missing_partitions(session: AsyncSession, ahead: int) -> list[str]:
+    """Statements creating the partitions still missing, up to `ahead` months."""
+    await session.execute(LOCK_SQL)
+    current = month_start(datetime.now(timezone.utc).date())
+    statements = []
+    for table in PARTITIONED_TABLES:
+        existing = await partition_months(session, table)
+        for n in range(ahead + 1):
+            month = add_months(current, n)
+            if month in existing:
+                continue
+            # The month's rows would have to move out of the default
+            # partition first; they are left there, where queries still
+            # find them.
+            if await in_default_partition(session, table, month):
+                logger.warning(
+                    "%s has rows for %s in its default partition",
+                    table,
+                    month.strftime("%Y-%m"),
+                )
+                continue
+            statements.append(create_partition_sql(table, month))
+    return statements
+
+
+async def create_ahead(ahead: int = PARTITIONS_AHEAD):
+    async with sessionmanager.session() as session:
+        statements = await missing_partitions(session, ahead)
+        for statement in statements:
+            await session.execute(text(statement))
+        await session.commit()
+    if statements:
+        logger.info("Created %d partition(s)", len(statements))
+
+
+async def keep_partitions_ahead(interval: float = PARTITIONS_CHECK_SECONDS):
+    while True:
+        try:
+            await create_ahead()
+        except Exception:
+            logger.exception("Creating partitions ahead failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+
+async def prepare_statements(connection: AsyncConnection, statements: list[TextClause]):
+    # Prepares each statement into the asyncpg adapter's per-connection cache,
+    # keyed by the same SQL string SQLAlchemy sends when the route runs it.
+    raw = await connection.get_raw_connection()
+    adapted = raw.dbapi_connection
+    prepare = getattr(adapted, "_prepare", None)
+    if prepare is None:
+        return
+
+    for statement in statements:
+        sql = str(statement.compile(dialect=connection.dialect))
+        await prepare(sql, connection.dialect._invalidate_schema_cache_asof)
+
+
+async def warm_up_engine(engine: AsyncEngine, statements: list[TextClause]):
+    size = engine.pool.size()
+    # Every connection is held until all of them are open so the pool is
+    # filled with distinct connections rather than reusing one.
+    barrier = asyncio.Barrier(size)
+
+    async def warm_up_connection():
+        async with engine.connect() as connection:
+            await prepare_statements(connection, statements)
+            await barrier.wait()
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(size):
+            tg.create_task(warm_up_connection())
+
+
+async def warm_up(
+    engines: list[tuple[AsyncEngine, list[TextClause]]],
+    retry_delay: float = 2.0,
+    max_retry_delay: float = 30.0,
+):
+    while True:
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for engine, statements in engines:
+                    tg.create_task(warm_up_engine(engine, statements))
+            return
+        except Exception as e:
+            logger.warning("Database warm-up failed, retrying: %r", e)
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, max_retry_delay)
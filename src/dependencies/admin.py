@@ -1,12 +1,12 @@
 from fastapi import HTTPException, Request, status
-from sqlalchemy import select
-from src.models.user import User
 from src.models.enum import UserRoles
+from src.schemas.auth import TokenUser
 from src.utils.token import decode_admin_access_token
 from src.dependencies.core import DBSessionDep
+from src.dependencies.user import load_user, reject_revoked
 
 
-async def get_current_admin_user(request: Request, db: DBSessionDep):
+def get_admin_token_payload(request: Request) -> dict | None:
     token = ""
     auth_header = request.headers.get("Authorization")
     if auth_header is None or not auth_header.startswith("Bearer "):
@@ -25,16 +25,39 @@ async def get_current_admin_user(request: Request, db: DBSessionDep):
             detail="Token payload not available",
         )
 
-    result = await db.execute(select(User).where(User.id == payload["user_id"]))
-    user = result.scalar_one_or_none()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Not authorized"
-        )
+    return payload
+
 
-    if user.role != UserRoles.ADMIN:
+def check_admin_role(role: UserRoles | str):
+    if role != UserRoles.ADMIN and role != UserRoles.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized role"
         )
 
+
+async def get_current_admin_user(request: Request, db: DBSessionDep):
+    payload = get_admin_token_payload(request)
+    if payload is None:
+        return None
+
+    await reject_revoked(db, payload)
+    if "iat" not in payload:
+        user = await load_user(db, payload["user_id"])
+        check_admin_role(user.role)
+        return TokenUser(id=user.id, email=user.email, role=user.role)
+
+    check_admin_role(payload.get("role"))
+    return TokenUser(
+        id=payload["user_id"], email=payload["email"], role=payload["role"]
+    )
+
+
+async def get_current_admin_db_user(request: Request, db: DBSessionDep):
+    payload = get_admin_token_payload(request)
+    if payload is None:
+        return None
+
+    await reject_revoked(db, payload)
+    user = await load_user(db, payload["user_id"])
+    check_admin_role(user.role)
     return user
@@ -0,0 +1,48 @@
+import contextlib
+import math
+from fastapi import Depends, HTTPException, Request, status
+from src.core.admission import (
+    AdmissionGate,
+    Overloaded,
+    RateLimiter,
+    signin_limiter,
+    submission_limiter,
+)
+from src.dependencies.user import get_current_user
+from src.schemas.auth import TokenUser
+
+
+def check_rate_limit(limiter: RateLimiter, key: str):
+    retry_after = limiter.take(key)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+async def limit_submissions(user: TokenUser | None = Depends(get_current_user)):
+    if user is not None:
+        check_rate_limit(submission_limiter, str(user.id))
+
+
+async def limit_signins(request: Request):
+    # There is no user yet, so sign-ins are limited per client address.
+    check_rate_limit(signin_limiter, request.client.host if request.client else "")
+
+
+@contextlib.asynccontextmanager
+async def admitted(gate: AdmissionGate):
+    try:
+        await gate.acquire()
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy",
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    try:
+        yield
+    finally:
+        gate.release()
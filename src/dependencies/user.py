@@ -1,11 +1,13 @@
 from fastapi import HTTPException, Request, status
 from sqlalchemy import select
 from src.models.user import User
+from src.schemas.auth import TokenUser
+from src.utils.revocation import revocation_epochs
 from src.utils.token import decode_access_token
 from src.dependencies.core import DBSessionDep
 
 
-async def get_current_user(request: Request, db: DBSessionDep):
+def get_token_payload(request: Request) -> dict | None:
     token = ""
 
     auth_header = request.headers.get("Authorization")
@@ -25,7 +27,11 @@ async def get_current_user(request: Request, db: DBSessionDep):
             detail="Token payload not available",
         )
 
-    result = await db.execute(select(User).where(User.id == payload["user_id"]))
+    return payload
+
+
+async def load_user(db: DBSessionDep, user_id: str) -> User:
+    result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(
@@ -33,3 +39,26 @@ async def get_current_user(request: Request, db: DBSessionDep):
         )
 
     return user
+
+
+async def reject_revoked(db: DBSessionDep, payload: dict):
+    if await revocation_epochs.is_revoked(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session revoked"
+        )
+
+
+async def get_current_user(request: Request, db: DBSessionDep):
+    payload = get_token_payload(request)
+    if payload is None:
+        return None
+
+    await reject_revoked(db, payload)
+    # Tokens issued before they carried iat may hold stale claims.
+    if "iat" not in payload:
+        user = await load_user(db, payload["user_id"])
+        return TokenUser(id=user.id, email=user.email, role=user.role)
+
+    return TokenUser(
+        id=payload["user_id"], email=payload["email"], role=payload["role"]
+    )
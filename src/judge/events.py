@@ -0,0 +1,123 @@
+import asyncio
+import os
+from collections import deque
+from typing import Any
+from uuid import UUID
+from src.utils.responses import sse_event
+
+# Events kept per submission for late subscribers, and the most a slow
+# subscriber may fall behind before it is disconnected.
+JUDGE_EVENTS_BUFFER = int(os.environ.get("JUDGE_EVENTS_BUFFER", 64))
+# How long a finished submission's events stay available.
+JUDGE_EVENTS_LINGER_SECONDS = float(os.environ.get("JUDGE_EVENTS_LINGER_SECONDS", 30))
+# Quiet streams get a comment this often so proxies keep them open.
+JUDGE_EVENTS_HEARTBEAT_SECONDS = float(
+    os.environ.get("JUDGE_EVENTS_HEARTBEAT_SECONDS", 15)
+)
+# A stream is ended after this long even if the verdict never came.
+JUDGE_EVENTS_MAX_SECONDS = float(os.environ.get("JUDGE_EVENTS_MAX_SECONDS", 300))
+# Submissions judged by another process are polled for their verdict.
+JUDGE_EVENTS_POLL_SECONDS = float(os.environ.get("JUDGE_EVENTS_POLL_SECONDS", 1))
+
+
+class Channel:
+    def __init__(self, user_id: str, buffer: int):
+        self.user_id = user_id
+        self.history: deque[bytes] = deque(maxlen=buffer)
+        # Each subscriber's queue, with how long it may grow.
+        self.subscribers: dict[asyncio.Queue, int] = {}
+        self.closed = False
+
+
+class SubmissionEvents:
+    """Fans out the judge's events for a submission to every open stream.
+
+    Each event is encoded once, whatever the number of subscribers. A
+    subscriber's queue ends with None: when the submission is done, or
+    early when it falls more than `buffer` events behind.
+    """
+
+    def __init__(self, buffer: int, linger: float):
+        self.buffer = buffer
+        self.linger = linger
+        self.published = 0
+        self.dropped = 0
+        self._channels: dict[str, Channel] = {}
+
+    def open(self, submission_id: UUID | str, user_id: UUID | str) -> Channel:
+        channel = Channel(str(user_id), self.buffer)
+        previous = self._channels.get(str(submission_id))
+        if previous is not None and not previous.closed:
+            # Streams waiting on a verdict poll move over to the judge.
+            channel.subscribers = previous.subscribers
+            previous.closed = True
+        self._channels[str(submission_id)] = channel
+        return channel
+
+    def owner(self, submission_id: UUID | str) -> str | None:
+        channel = self._channels.get(str(submission_id))
+        return channel.user_id if channel is not None else None
+
+    def publish(self, submission_id: UUID | str, event: str, data: Any):
+        channel = self._channels.get(str(submission_id))
+        if channel is None or channel.closed:
+            return
+
+        self.published += 1
+        message = sse_event(event, data)
+        channel.history.append(message)
+        for queue, limit in list(channel.subscribers.items()):
+            if queue.qsize() >= limit:
+                self.dropped += 1
+                del channel.subscribers[queue]
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(message)
+
+    def close(self, submission_id: UUID | str, linger: bool = True):
+        channel = self._channels.get(str(submission_id))
+        if channel is None or channel.closed:
+            return
+
+        channel.closed = True
+        for queue in channel.subscribers:
+            queue.put_nowait(None)
+        channel.subscribers.clear()
+        if linger:
+            asyncio.get_running_loop().call_later(
+                self.linger, self._channels.pop, str(submission_id), None
+            )
+        else:
+            del self._channels[str(submission_id)]
+
+    def subscribe(self, submission_id: UUID | str) -> asyncio.Queue | None:
+        """A queue replaying the events so far, or None if there is no channel."""
+        channel = self._channels.get(str(submission_id))
+        if channel is None:
+            return None
+
+        queue = asyncio.Queue()
+        for message in channel.history:
+            queue.put_nowait(message)
+        if channel.closed:
+            queue.put_nowait(None)
+        else:
+            # Room for the replayed history plus `buffer` new events.
+            channel.subscribers[queue] = queue.qsize() + self.buffer
+        return queue
+
+    def unsubscribe(self, submission_id: UUID | str, queue: asyncio.Queue):
+        channel = self._channels.get(str(submission_id))
+        if channel is not None:
+            channel.subscribers.pop(queue, None)
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+            "published": self.published,
+            "dropped_subscribers": self.dropped,
+        }
+
+
+submission_events = SubmissionEvents(JUDGE_EVENTS_BUFFER, JUDGE_EVENTS_LINGER_SECONDS)
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from uuid import UUID
+from src.core.db import sessionmanager
+from src.judge.events import (
+    JUDGE_EVENTS_MAX_SECONDS,
+    JUDGE_EVENTS_POLL_SECONDS,
+    SubmissionEvents,
+    submission_events,
+)
+from src.models.enum import Status
+from src.queries import queries
+
+logger = logging.getLogger(__name__)
+
+
+class VerdictPoller:
+    """Polls the database for verdicts of submissions judged elsewhere.
+
+    One task per submission publishes the verdict to its channel, so every
+    stream open on it in this process shares the one poll. The task stops
+    once no stream is left.
+    """
+
+    def __init__(self, events: SubmissionEvents, interval: float, max_seconds: float):
+        self.events = events
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.polls = 0
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def watch(self, submission_id: UUID | str, user_id: UUID | str):
+        key = str(submission_id)
+        if key in self._tasks:
+            return
+
+        channel = self.events.open(key, user_id)
+        task = asyncio.create_task(self._poll(key, str(user_id), channel))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    async def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _poll(self, submission_id: str, user_id: str, channel):
+        deadline = time.monotonic() + self.max_seconds
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.interval)
+                # Closed here means a judge in this process took it over.
+                if channel.closed:
+                    return
+                if not channel.subscribers:
+                    break
+
+                self.polls += 1
+                async with sessionmanager.session() as session:
+                    result = await queries.execute(
+                        session,
+                        "user.submission_verdict",
+                        {"submission_id": submission_id, "user_id": user_id},
+                    )
+                    row = result.mappings().first()
+                if channel.closed:
+                    return
+                if row is None:
+                    break
+                if row["status"] != Status.Pending.value:
+                    self.events.publish(
+                        submission_id,
+                        "verdict",
+                        {**row, "cached": None, "tests": None},
+                    )
+                    self.events.close(submission_id)
+                    return
+        except Exception:
+            logger.exception("Polling submission %s failed", submission_id)
+        finally:
+            # Without a verdict nothing is kept, so the next stream polls anew.
+            if not channel.closed:
+                self.events.close(submission_id, linger=False)
+
+    def stats(self) -> dict:
+        return {"polling": len(self._tasks), "polls": self.polls}
+
+
+verdict_poller = VerdictPoller(
+    submission_events, JUDGE_EVENTS_POLL_SECONDS, JUDGE_EVENTS_MAX_SECONDS
+)
@@ -0,0 +1,218 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+from collections import Counter, deque
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.judge import sandbox
+from src.judge.sandbox import JudgeJob, JudgeResult, TestRun
+
+logger = logging.getLogger(__name__)
+
+JUDGE_WORKERS = int(os.environ.get("JUDGE_WORKERS", 0))
+JUDGE_MAX_QUEUE = int(os.environ.get("JUDGE_MAX_QUEUE", 1000))
+# Workers are replaced after this many submissions, bounding any leak.
+JUDGE_TASKS_PER_WORKER = int(os.environ.get("JUDGE_TASKS_PER_WORKER", 500))
+# Without a network namespace and seccomp, submitted code can reach the
+# network; the app refuses to start that way unless this is set.
+JUDGE_ALLOW_UNCONFINED = os.environ.get("JUDGE_ALLOW_UNCONFINED", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+class JudgePool:
+    """Pre-forked worker processes that judge submissions.
+
+    Workers come from a forkserver, so they never inherit the app's event
+    loop or database connections. Each test is run in a further confined
+    child of the worker; see src.judge.sandbox.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        tasks_per_worker: int,
+        allow_unconfined: bool = False,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.tasks_per_worker = tasks_per_worker
+        self.allow_unconfined = allow_unconfined
+        self.in_flight = 0
+        # Submissions from admission until their judging ends, including
+        # those not handed to a worker yet.
+        self.admitted = 0
+        self.judged = 0
+        self.failures = 0
+        self.verdicts: Counter[str] = Counter()
+        self.features: dict | None = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(["src.judge.sandbox"])
+        # Shared by all workers; a thread hands what they report to the loop.
+        self._progress = None
+        self._listeners: dict[int, Callable[[int, TestRun], None]] = {}
+        self._job_ids = itertools.count()
+        self._test_times: deque[float] = deque(maxlen=2048)
+        self._tests_run = 0
+        self._max_test_time = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    @property
+    def free(self) -> int:
+        return self.workers + self.max_queue - max(self.admitted, self.in_flight)
+
+    @property
+    def full(self) -> bool:
+        return self.free <= 0
+
+    def admit(self):
+        self.admitted += 1
+
+    def release(self):
+        self.admitted -= 1
+
+    def check_confinement(self):
+        """Refuses to judge where submissions would not be confined.
+
+        Runs in the app process, before any worker is forked; the workers
+        run on the same host with the same privileges.
+        """
+        features = sandbox.features()
+        missing = [
+            name for name in ("network_namespace", "seccomp") if not features[name]
+        ]
+        if not missing:
+            return
+        if not self.allow_unconfined:
+            raise Exception(
+                f"Judge sandbox has no {', '.join(missing)}; set "
+                "JUDGE_ALLOW_UNCONFINED to run submissions without them"
+            )
+        logger.warning(
+            "Judge sandbox has no %s; submissions are not confined",
+            ", ".join(missing),
+        )
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._progress = self._context.SimpleQueue()
+        threading.Thread(
+            target=self._read_progress,
+            args=(loop, self._progress),
+            name="judge-progress",
+            daemon=True,
+        ).start()
+        self._executor = self._new_executor()
+        # One call per worker, so all of them are forked before traffic.
+        await asyncio.gather(
+            *[
+                loop.run_in_executor(self._executor, sandbox.ready)
+                for _ in range(self.workers)
+            ]
+        )
+        self.features = await loop.run_in_executor(self._executor, sandbox.features)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._progress is not None:
+            self._progress.put(None)
+            self._progress = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=sandbox.init_worker,
+            initargs=(self._progress,),
+            max_tasks_per_child=self.tasks_per_worker,
+        )
+
+    def _read_progress(self, loop: asyncio.AbstractEventLoop, progress):
+        while (item := progress.get()) is not None:
+            try:
+                loop.call_soon_threadsafe(self._dispatch, *item)
+            except RuntimeError:
+                # The loop closed under us.
+                return
+
+    def _dispatch(self, job_id: int, index: int, run: TestRun):
+        listener = self._listeners.get(job_id)
+        if listener is not None:
+            listener(index, run)
+
+    async def judge(
+        self, job: JudgeJob, on_test: Callable[[int, TestRun], None] | None = None
+    ) -> JudgeResult:
+        """Judges a job; on_test is called on the loop as each test finishes.
+
+        Reports can still be in flight when the result is returned, so the
+        result's own list of tests is the complete one.
+        """
+        if self._executor is None:
+            raise Exception("JudgePool is not started")
+
+        job_id = next(self._job_ids)
+        if on_test is not None:
+            self._listeners[job_id] = on_test
+        self.in_flight += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, sandbox.judge, job, job_id
+            )
+        except BrokenProcessPool:
+            # A worker died abruptly; everything queued on it fails, and a
+            # fresh pool takes the next submissions.
+            logger.error("Judge pool broke, restarting it")
+            self.failures += 1
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            raise
+        finally:
+            self.in_flight -= 1
+            self._listeners.pop(job_id, None)
+
+        self.judged += 1
+        self.verdicts[result.status] += 1
+        for test in result.tests:
+            self._tests_run += 1
+            self._test_times.append(test.time_ms)
+            self._max_test_time = max(self._max_test_time, test.time_ms)
+        return result
+
+    def stats(self) -> dict:
+        times = sorted(self._test_times)
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "running": min(self.in_flight, self.workers),
+            "queued": max(self.admitted - min(self.in_flight, self.workers), 0),
+            "max_queue": self.max_queue,
+            "judged": self.judged,
+            "failures": self.failures,
+            "verdicts": dict(self.verdicts),
+            "sandbox": self.features,
+            "tests": {
+                "run": self._tests_run,
+                "mean_ms": round(sum(times) / len(times), 3) if times else None,
+                "p95_ms": times[int(len(times) * 0.95)] if times else None,
+                "max_ms": self._max_test_time,
+            },
+        }
+
+
+judge_pool = JudgePool(
+    JUDGE_WORKERS, JUDGE_MAX_QUEUE, JUDGE_TASKS_PER_WORKER, JUDGE_ALLOW_UNCONFINED
+)
@@ -0,0 +1,320 @@
+"""Runs submitted code against testcases; executed inside judge workers.
+
+Every test runs in a freshly forked child that is confined before it
+execs the interpreter: rlimits always, and where the host allows it a
+private network namespace, an unprivileged uid and a seccomp filter.
+"""
+
+import errno
+import math
+import os
+import resource
+import selectors
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from typing import NamedTuple
+
+try:
+    import seccomp
+except ImportError:
+    try:
+        import pyseccomp as seccomp
+    except (ImportError, RuntimeError):
+        # RuntimeError: the bindings are installed but libseccomp is not.
+        seccomp = None
+
+NOBODY = 65534
+OUTPUT_LIMIT = 16 * 1024 * 1024
+ENV = {"PATH": "/usr/bin:/bin", "LANG": "C.UTF-8", "PYTHONIOENCODING": "utf-8"}
+# The submission cannot open sockets, trace or spawn processes.
+DENIED_SYSCALLS = [
+    "socket",
+    "socketpair",
+    "connect",
+    "bind",
+    "listen",
+    "accept",
+    "accept4",
+    "ptrace",
+    "fork",
+    "vfork",
+    "clone",
+    "clone3",
+    "mount",
+    "unshare",
+    "setns",
+]
+
+ACCEPTED = "Accepted"
+REJECTED = "Rejected"
+TIME_LIMIT = "TimeLimit"
+MEMORY_LIMIT = "MemoryLimit"
+RUNTIME_ERROR = "RuntimeError"
+SYSTEM_ERROR = "SystemError"
+
+# Set in each worker by init_worker; finished tests are reported on it.
+_progress = None
+
+
+class JudgeJob(NamedTuple):
+    code: str
+    # (input, expected output) pairs, in order.
+    tests: list[tuple[str, str]]
+    time_limit_ms: int
+    memory_limit_mb: int
+
+
+class TestRun(NamedTuple):
+    status: str
+    time_ms: float
+    memory_kb: int
+
+
+class JudgeResult(NamedTuple):
+    status: str
+    passed: int
+    total: int
+    tests: list[TestRun]
+
+
+def init_worker(progress):
+    global _progress
+    _progress = progress
+
+
+def ready() -> int:
+    return os.getpid()
+
+
+def judge(job: JudgeJob, job_id: int | None = None) -> JudgeResult:
+    """Runs tests in order and stops at the first one that fails.
+
+    With a job_id, (job_id, index, TestRun) is put on the progress queue as
+    each test finishes. A job without tests is never Accepted.
+    """
+    if not job.tests:
+        return JudgeResult(SYSTEM_ERROR, 0, 0, [])
+    workdir = tempfile.mkdtemp(prefix="judge-")
+    try:
+        path = os.path.join(workdir, "main.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(job.code)
+        os.chmod(workdir, 0o755)
+        os.chmod(path, 0o644)
+
+        runs = []
+        for index, (test_input, expected) in enumerate(job.tests):
+            run = _run_test(path, workdir, test_input, expected, job)
+            runs.append(run)
+            if _progress is not None and job_id is not None:
+                _progress.put((job_id, index, run))
+            if run.status != ACCEPTED:
+                return JudgeResult(run.status, len(runs) - 1, len(job.tests), runs)
+        return JudgeResult(ACCEPTED, len(runs), len(job.tests), runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_test(
+    path: str, workdir: str, test_input: str, expected: str, job: JudgeJob
+) -> TestRun:
+    stdout, stderr, status, usage, timed_out, overflowed = _execute(
+        path, workdir, test_input.encode("utf-8"), job
+    )
+    time_ms = (usage.ru_utime + usage.ru_stime) * 1000
+    memory_kb = usage.ru_maxrss
+
+    if timed_out or time_ms > job.time_limit_ms:
+        verdict = TIME_LIMIT
+    elif os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGXCPU:
+        verdict = TIME_LIMIT
+    elif memory_kb > job.memory_limit_mb * 1024 or b"MemoryError" in stderr:
+        verdict = MEMORY_LIMIT
+    elif overflowed:
+        verdict = REJECTED
+    elif not os.WIFEXITED(status) or os.WEXITSTATUS(status) != 0:
+        verdict = RUNTIME_ERROR
+    elif _normalize(stdout.decode("utf-8", "replace")) == _normalize(expected):
+        verdict = ACCEPTED
+    else:
+        verdict = REJECTED
+    return TestRun(verdict, round(time_ms, 3), memory_kb)
+
+
+def _normalize(output: str) -> list[str]:
+    # Trailing whitespace and trailing blank lines are not significant.
+    lines = [line.rstrip() for line in output.splitlines()]
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _execute(path: str, workdir: str, data: bytes, job: JudgeJob):
+    stdin_r, stdin_w = os.pipe()
+    stdout_r, stdout_w = os.pipe()
+    stderr_r, stderr_w = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.dup2(stdin_r, 0)
+            os.dup2(stdout_w, 1)
+            os.dup2(stderr_w, 2)
+            os.closerange(3, 65536)
+            os.chdir(workdir)
+            _confine(job)
+            os.execve(sys.executable, [sys.executable, "-I", "-S", "-B", path], ENV)
+        finally:
+            os._exit(127)
+
+    os.close(stdin_r)
+    os.close(stdout_w)
+    os.close(stderr_w)
+
+    # CPU time is capped by RLIMIT_CPU; this catches code that sleeps or
+    # blocks instead of computing.
+    deadline = time.monotonic() + job.time_limit_ms / 1000 * 3 + 1
+    output = {stdout_r: bytearray(), stderr_r: bytearray()}
+    timed_out = overflowed = False
+    offset = 0
+
+    selector = selectors.DefaultSelector()
+    os.set_blocking(stdin_w, False)
+    if data:
+        selector.register(stdin_w, selectors.EVENT_WRITE)
+    else:
+        os.close(stdin_w)
+    selector.register(stdout_r, selectors.EVENT_READ)
+    selector.register(stderr_r, selectors.EVENT_READ)
+
+    try:
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in selector.select(remaining):
+                fd = key.fd
+                if fd == stdin_w:
+                    try:
+                        offset += os.write(fd, data[offset : offset + 65536])
+                    except BrokenPipeError:
+                        offset = len(data)
+                    if offset >= len(data):
+                        selector.unregister(fd)
+                        os.close(fd)
+                    continue
+
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    selector.unregister(fd)
+                    os.close(fd)
+                    continue
+                output[fd] += chunk
+                if len(output[fd]) > OUTPUT_LIMIT:
+                    overflowed = True
+                    break
+            if overflowed:
+                break
+    finally:
+        for key in list(selector.get_map().values()):
+            selector.unregister(key.fd)
+            os.close(key.fd)
+        selector.close()
+        if timed_out or overflowed:
+            _kill(pid)
+
+    # The child may close its output and keep running, so waiting for it
+    # is bounded by the same deadline.
+    while True:
+        waited, status, usage = os.wait4(pid, os.WNOHANG)
+        if waited:
+            break
+        if time.monotonic() >= deadline:
+            timed_out = True
+            _kill(pid)
+            _, status, usage = os.wait4(pid, 0)
+            break
+        time.sleep(0.002)
+
+    return (
+        bytes(output[stdout_r]),
+        bytes(output[stderr_r]),
+        status,
+        usage,
+        timed_out,
+        overflowed,
+    )
+
+
+def _kill(pid: int):
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _confine(job: JudgeJob):
+    # Runs in the forked child, before exec. Namespaces and the uid change
+    # are best effort; the rlimits are not.
+    cpu_seconds = math.ceil(job.time_limit_ms / 1000) + 1
+    memory = job.memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (16, 16))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+    os.setsid()
+    _try(_unshare_network)
+    if os.geteuid() == 0:
+        os.setgroups([])
+        os.setgid(NOBODY)
+        os.setuid(NOBODY)
+    # Set after the uid change: the kernel refuses exec when the limit is
+    # already exceeded at setuid time.
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+
+    if seccomp is not None:
+        syscall_filter = seccomp.SyscallFilter(defaction=seccomp.ALLOW)
+        for name in DENIED_SYSCALLS:
+            _try(syscall_filter.add_rule, seccomp.ERRNO(errno.EPERM), name)
+        syscall_filter.load()
+
+
+def _try(call, *args):
+    try:
+        call(*args)
+    except (OSError, ValueError, RuntimeError):
+        pass
+
+
+def features() -> dict:
+    """What confinement this host gives beyond rlimits."""
+    return {
+        "seccomp": seccomp is not None,
+        "unprivileged_uid": os.geteuid() == 0,
+        "network_namespace": _probe(_unshare_network),
+    }
+
+
+def _unshare_network():
+    if os.geteuid() == 0:
+        os.unshare(os.CLONE_NEWNET)
+    else:
+        os.unshare(os.CLONE_NEWUSER | os.CLONE_NEWNET)
+
+
+def _probe(confine) -> bool:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            confine()
+            os._exit(0)
+        except BaseException:
+            os._exit(1)
+    _, status = os.waitpid(pid, 0)
+    return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
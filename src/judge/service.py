@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import os
+from uuid import UUID
+from src.core.code_store import code_store
+from src.core.db import sessionmanager
+from src.judge.events import SubmissionEvents, submission_events
+from src.judge.pool import JudgePool, judge_pool
+from src.judge.sandbox import JudgeJob, TestRun
+from src.judge.verdicts import Verdict, VerdictCache, verdict_cache
+from src.models.enum import Status
+from src.queries import queries
+from src.utils.catalog import catalog_cache
+from src.utils.code_blob import normalized_code_hash
+
+logger = logging.getLogger(__name__)
+
+JUDGE_DEFAULT_TIME_LIMIT_MS = int(os.environ.get("JUDGE_DEFAULT_TIME_LIMIT_MS", 2000))
+JUDGE_DEFAULT_MEMORY_LIMIT_MB = int(
+    os.environ.get("JUDGE_DEFAULT_MEMORY_LIMIT_MB", 256)
+)
+JUDGE_STALE_SECONDS = int(os.environ.get("JUDGE_STALE_SECONDS", 300))
+JUDGE_REQUEUE_SECONDS = float(os.environ.get("JUDGE_REQUEUE_SECONDS", 60))
+
+
+class SubmissionJudge:
+    """Judges Pending submissions in the background and records the verdict."""
+
+    def __init__(
+        self, pool: JudgePool, verdicts: VerdictCache, events: SubmissionEvents
+    ):
+        self.pool = pool
+        self.verdicts = verdicts
+        self.events = events
+        self._tasks: set[asyncio.Task] = set()
+        self._requeue_task: asyncio.Task | None = None
+        self._judging: set[UUID] = set()
+
+    async def start(self):
+        await self.pool.start()
+        # Other processes can stop mid-judging at any time, not only before
+        # this one starts.
+        self._requeue_task = asyncio.create_task(self._keep_requeueing())
+
+    async def close(self):
+        if self._requeue_task is not None:
+            self._requeue_task.cancel()
+            await asyncio.gather(self._requeue_task, return_exceptions=True)
+            self._requeue_task = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.pool.close()
+
+    def submit(
+        self, submission_id: UUID, problem_id: UUID, user_id: UUID | str, code: str
+    ):
+        self.events.open(submission_id, user_id)
+        self._judging.add(submission_id)
+        task = asyncio.create_task(self.judge(submission_id, problem_id, code))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def judge(self, submission_id: UUID, problem_id: UUID, code: str):
+        try:
+            digest = normalized_code_hash(code)
+            # No connection is held while the code runs.
+            async with sessionmanager.session() as session:
+                version = await self._testcase_version(session, problem_id)
+                key = self.verdicts.key(digest, problem_id, version)
+                verdict = await self.verdicts.get(session, key)
+                if verdict is None:
+                    job, version = await self._job(session, problem_id, code)
+                    key = self.verdicts.key(digest, problem_id, version)
+
+            cached = verdict is not None
+            tests = None
+            if not cached:
+
+                def on_test(index: int, run: TestRun):
+                    self.events.publish(submission_id, "test", _test_event(index, run))
+
+                result = await self.pool.judge(job, on_test)
+                verdict = Verdict(result.status, result.passed, result.total)
+                tests = [_test_event(i, run) for i, run in enumerate(result.tests)]
+
+            async with sessionmanager.session() as session:
+                await queries.execute(
+                    session,
+                    "judge.record_verdict",
+                    {
+                        "submission_id": submission_id,
+                        "status": verdict.status,
+                        "passed_testcases": verdict.passed,
+                        "total_testcases": verdict.total,
+                    },
+                )
+                if not cached:
+                    await self.verdicts.put(session, key, verdict)
+                await session.commit()
+
+            self.events.publish(
+                submission_id,
+                "verdict",
+                {**verdict._asdict(), "cached": cached, "tests": tests},
+            )
+        except Exception:
+            logger.exception("Judging submission %s failed", submission_id)
+            await self._record_failure(submission_id)
+        finally:
+            self._judging.discard(submission_id)
+            self.pool.release()
+            self.events.close(submission_id)
+
+    async def _record_failure(self, submission_id: UUID):
+        verdict = Verdict(Status.SystemError.value, 0, 0)
+        try:
+            async with sessionmanager.session() as session:
+                await queries.execute(
+                    session,
+                    "judge.record_verdict",
+                    {
+                        "submission_id": submission_id,
+                        "status": verdict.status,
+                        "passed_testcases": verdict.passed,
+                        "total_testcases": verdict.total,
+                    },
+                )
+                await session.commit()
+        except Exception:
+            # Left Pending, it is picked up again by requeue_stale on a
+            # later start.
+            logger.exception("Recording the failure of %s failed", submission_id)
+            return
+
+        self.events.publish(
+            submission_id,
+            "verdict",
+            {**verdict._asdict(), "cached": False, "tests": None},
+        )
+
+    async def _testcase_version(self, session, problem_id: UUID) -> int | None:
+        # Problem edits publish a catalog change, which drops this entry in
+        # every worker.
+        async def build():
+            result = await queries.execute(
+                session, "judge.testcase_version", {"problem_id": problem_id}
+            )
+            return result.scalar_one_or_none()
+
+        entry = await catalog_cache.get(f"testcase_version:{problem_id}", build)
+        return entry.value
+
+    async def _job(self, session, problem_id: UUID, code: str):
+        result = await queries.execute(
+            session, "judge.problem_tests", {"problem_id": problem_id}
+        )
+        rows = result.all()
+        if not any(row.input is not None for row in rows):
+            # Judged against nothing, any code would be Accepted.
+            raise Exception(f"Problem {problem_id} has no testcases")
+        time_limit, memory_limit, version = rows[0][:3] if rows else (None, None, None)
+        job = JudgeJob(
+            code=code,
+            tests=[(row.input, row.output) for row in rows if row.input is not None],
+            time_limit_ms=time_limit or JUDGE_DEFAULT_TIME_LIMIT_MS,
+            memory_limit_mb=memory_limit or JUDGE_DEFAULT_MEMORY_LIMIT_MB,
+        )
+        return job, version
+
+    async def _keep_requeueing(self, interval: float = JUDGE_REQUEUE_SECONDS):
+        while True:
+            try:
+                await self.renew()
+                await self.requeue_stale()
+            except Exception:
+                logger.exception("Requeueing stale submissions failed")
+            await asyncio.sleep(interval)
+
+    async def renew(self):
+        if not self._judging:
+            return
+        async with sessionmanager.session() as session:
+            await queries.execute(
+                session,
+                "judge.renew_pending",
+                {"submission_ids": list(self._judging)},
+            )
+            await session.commit()
+
+    async def requeue_stale(self):
+        # Only as many as the queue has room for; the rest stay claimable.
+        if self.pool.free <= 0:
+            return
+        async with sessionmanager.session() as session:
+            result = await queries.execute(
+                session,
+                "judge.claim_stale_pending",
+                {"stale_seconds": JUDGE_STALE_SECONDS, "limit": self.pool.free},
+            )
+            rows = [
+                await code_store.with_code(session, row) for row in result.mappings()
+            ]
+            await session.commit()
+
+        requeued = 0
+        for row in rows:
+            # Submissions admitted while claiming may have taken the room;
+            # what is left over is claimed again once it goes stale.
+            if self.pool.full:
+                break
+            self.pool.admit()
+            self.submit(
+                row["submission_id"], row["problem_id"], row["user_id"], row["code"]
+            )
+            requeued += 1
+        if requeued:
+            logger.info("Requeued %d stale Pending submission(s)", requeued)
+
+
+def _test_event(index: int, run: TestRun) -> dict:
+    return {"test": index + 1, **run._asdict()}
+
+
+submission_judge = SubmissionJudge(judge_pool, verdict_cache, submission_events)
@@ -0,0 +1,91 @@
+import os
+import time
+from typing import NamedTuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.judge.sandbox import TIME_LIMIT
+from src.queries import queries
+from src.utils.cache import TTLCache
+
+VERDICT_CACHE_SIZE = int(os.environ.get("VERDICT_CACHE_SIZE", 10000))
+VERDICT_CACHE_TTL_SECONDS = int(os.environ.get("VERDICT_CACHE_TTL_SECONDS", 3600))
+# Whether a submission fits the time limit depends on how busy the host
+# was, so those verdicts are always judged again.
+UNCACHED_STATUSES = {TIME_LIMIT}
+
+
+class VerdictKey(NamedTuple):
+    code_hash: bytes
+    problem_id: str
+    testcase_version: int
+
+
+class Verdict(NamedTuple):
+    status: str
+    passed: int
+    total: int
+
+
+class VerdictCache:
+    """Verdicts of code already judged against a problem's current testcases.
+
+    Stored in cached_verdict, with an in-process LRU in front. A key only
+    matches while the problem's testcase_version is unchanged, so nothing
+    has to be invalidated when testcases are edited.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.ttl = ttl
+        self._local = TTLCache(maxsize)
+        self.stored_hits = 0
+        self.stored_misses = 0
+
+    @staticmethod
+    def key(code_hash: bytes, problem_id: UUID | str, testcase_version: int):
+        return VerdictKey(code_hash, str(problem_id), testcase_version)
+
+    async def get(self, session: AsyncSession, key: VerdictKey) -> Verdict | None:
+        verdict = self._local.get(key)
+        if verdict is not None:
+            return verdict
+
+        result = await queries.execute(session, "judge.cached_verdict", key._asdict())
+        row = result.first()
+        if row is None:
+            self.stored_misses += 1
+            return None
+
+        self.stored_hits += 1
+        verdict = Verdict(str(row.status), row.passed_testcases, row.total_testcases)
+        self._local.set(key, verdict, time.time() + self.ttl)
+        return verdict
+
+    async def put(self, session: AsyncSession, key: VerdictKey, verdict: Verdict):
+        """Stores a verdict as part of the session's transaction."""
+        if verdict.status in UNCACHED_STATUSES or key.testcase_version is None:
+            return
+
+        await queries.execute(
+            session,
+            "judge.cache_verdict",
+            {
+                **key._asdict(),
+                "status": verdict.status,
+                "passed_testcases": verdict.passed,
+                "total_testcases": verdict.total,
+            },
+        )
+        self._local.set(key, verdict, time.time() + self.ttl)
+
+    def stats(self) -> dict:
+        local = self._local.stats()
+        hits = local["hits"] + self.stored_hits
+        lookups = local["hits"] + local["misses"]
+        return {
+            "local": local,
+            "stored": {"hits": self.stored_hits, "misses": self.stored_misses},
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+verdict_cache = VerdictCache(VERDICT_CACHE_SIZE, VERDICT_CACHE_TTL_SECONDS)
@@ -1,21 +1,86 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import math
+from fastapi import FastAPI, Request
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from src.routers.user import user_router
 from src.routers.admin import admin_router
-from src.core.db import sessionmanager
+from src.routers.health import health_router
+from src.core.batching import SUBMISSION_BATCHING, submission_batcher
+from src.core.code_store import code_store
+from src.core.db import DATABASE_POOL_TIMEOUT_SECONDS, sessionmanager
+from src.core.invalidation import catalog_listener
+from src.core.partitions import keep_partitions_ahead
+from src.judge.polling import verdict_poller
+from src.judge.service import submission_judge
+from src.core.warmup import warm_up
+from src.queries import queries
+from src.utils.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_up(app: FastAPI):
+    # Every registered query is prepared on the primary; replicas only
+    # ever serve the read-only ones.
+    primary_statements = [query.statement for query in queries]
+    read_statements = [query.statement for query in queries if query.read_only]
+    queries.compile_all(sessionmanager.engine.dialect)
+
+    await warm_up(
+        [(sessionmanager.engine, primary_statements)]
+        + [(engine, read_statements) for engine in sessionmanager.replica_engines]
+    )
+    # Until this runs, new code is stored without a dictionary.
+    async with sessionmanager.session() as session:
+        await code_store.load(session)
+    if submission_judge.pool.enabled:
+        await submission_judge.start()
+    app.state.ready = True
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    app.state.ready = False
+    if submission_judge.pool.enabled:
+        # Fails startup, rather than warm-up, so the process does not run.
+        submission_judge.pool.check_confinement()
+    replica_monitor = None
+    if sessionmanager.has_replicas:
+        await sessionmanager.check_replicas()
+        replica_monitor = asyncio.create_task(sessionmanager.monitor_replicas())
+
+    warm_up_task = asyncio.create_task(_warm_up(app))
+    listener_task = asyncio.create_task(catalog_listener.run())
+    partitions_task = asyncio.create_task(keep_partitions_ahead())
+    batcher_task = None
+    if SUBMISSION_BATCHING:
+        batcher_task = asyncio.create_task(submission_batcher.run())
+
     yield
+
+    warm_up_task.cancel()
+    await verdict_poller.close()
+    if submission_judge.pool.enabled:
+        await submission_judge.close()
+    listener_task.cancel()
+    partitions_task.cancel()
+    if batcher_task is not None:
+        # Lets the batcher write what is still queued before the engine closes.
+        batcher_task.cancel()
+        await asyncio.gather(batcher_task, return_exceptions=True)
+    if replica_monitor is not None:
+        replica_monitor.cancel()
     if sessionmanager._engine is not None:
         await sessionmanager.close()
 
 
 app = FastAPI(
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     description="A FastAPI application",
     swagger_ui_parameters={"defaultModelsExpandDepth": -1},
 )
@@ -34,5 +99,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # No pooled connection freed up within DATABASE_POOL_TIMEOUT_SECONDS.
+    logger.warning("Connection pool exhausted on %s", request.url.path)
+    return FastJSONResponse(
+        {"detail": "Server is busy"},
+        status_code=503,
+        headers={"Retry-After": str(math.ceil(DATABASE_POOL_TIMEOUT_SECONDS))},
+    )
+
+
+app.include_router(health_router)
 app.include_router(user_router, prefix="/api/v1")
 app.include_router(admin_router, prefix="/api/v1")
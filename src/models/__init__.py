@@ -1,12 +1,19 @@
 from .association import TopicProblem, ListProblem
 from .enum import Difficulty, Status, UserRoles, VoteType
+from .auth_epoch import AuthEpoch
 from .bookmark import Bookmark
+from .cached_verdict import CachedVerdict
+from .code_blob import CodeBlob
+from .code_dictionary import CodeDictionary
 from .list import List
 from .problem import Problem
+from .problem_stats import ProblemStats
 from .solution import Solution
+from .solved_problem import SolvedProblem
 from .testcase import TestCase
 from .topic import Topic
 from .user import User
+from .user_progress import UserProgress
 from .user_solution import UserSolution
 from .submission import Submission
 from .vote_problem import VoteProblem
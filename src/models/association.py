@@ -16,6 +16,7 @@ TopicProblem = Table(
         ForeignKey("problem.id", ondelete="CASCADE"),
         primary_key=True,
         nullable=False,
+        index=True,
     ),
 )
 
@@ -33,5 +34,6 @@ ListProblem = Table(
         ForeignKey("problem.id", ondelete="CASCADE"),
         primary_key=True,
         nullable=False,
+        index=True,
     ),
 )
@@ -0,0 +1,21 @@
+from sqlalchemy import ForeignKey, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from src.core.db import Base
+from uuid import UUID
+
+
+class AuthEpoch(Base):
+    __tablename__ = "auth_epoch"
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    epoch: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+    )
+
+    def __repr__(self):
+        return f"<AuthEpoch(user_id={self.user_id}, epoch={self.epoch})>"
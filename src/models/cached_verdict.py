@@ -0,0 +1,29 @@
+from sqlalchemy import ForeignKey, Integer, Enum, LargeBinary, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from .enum import Status
+from src.core.db import Base
+from uuid import UUID
+
+
+class CachedVerdict(Base):
+    __tablename__ = "cached_verdict"
+
+    # sha256 of the normalized source; see normalized_code_hash.
+    code_hash: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    problem_id: Mapped[UUID] = mapped_column(
+        ForeignKey("problem.id", ondelete="CASCADE"), primary_key=True
+    )
+    # problem.testcase_version the verdict was judged under.
+    testcase_version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[Status] = mapped_column(Enum(Status), nullable=False)
+    passed_testcases: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_testcases: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+    )
+
+    def __repr__(self):
+        return f"<CachedVerdict(code_hash={self.code_hash.hex()}, problem_id={self.problem_id}, testcase_version={self.testcase_version}, status={self.status})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import ForeignKey, Integer, LargeBinary, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from src.core.db import Base
+
+
+class CodeBlob(Base):
+    __tablename__ = "code_blob"
+
+    # sha256 of the UTF-8 source, so identical code is stored once.
+    hash: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    dictionary_id: Mapped[int | None] = mapped_column(
+        ForeignKey("code_dictionary.id"), nullable=True
+    )
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+    )
+
+    def __repr__(self):
+        return f"<CodeBlob(hash={self.hash.hex()}, dictionary_id={self.dictionary_id}, size={self.size})>"
@@ -0,0 +1,21 @@
+from sqlalchemy import Integer, LargeBinary, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from src.core.db import Base
+
+
+class CodeDictionary(Base):
+    __tablename__ = "code_dictionary"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # A zstd dictionary trained on submitted code; never changed once written,
+    # since blobs compressed with it need it to be read.
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+    )
+
+    def __repr__(self):
+        return f"<CodeDictionary(id={self.id}, size={len(self.data)})>"
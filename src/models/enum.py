@@ -23,3 +23,7 @@ class Status(enum.Enum):
     Rejected = "Rejected"
     Pending = "Pending"
     TimeLimit = "TimeLimit"
+    MemoryLimit = "MemoryLimit"
+    RuntimeError = "RuntimeError"
+    # The judge itself failed; the code was not found at fault.
+    SystemError = "SystemError"
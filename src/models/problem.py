@@ -36,15 +36,17 @@ class Problem(Base):
     rank: Mapped[int | None] = mapped_column(Integer, nullable=True, default=0)
     time_limit: Mapped[int | None] = mapped_column(Integer, nullable=True)
     memory_limit: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Bumped whenever the testcases or limits change; keys cached verdicts.
+    testcase_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
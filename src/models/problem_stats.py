@@ -0,0 +1,18 @@
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from src.core.db import Base
+from uuid import UUID
+
+
+class ProblemStats(Base):
+    __tablename__ = "problem_stats"
+
+    problem_id: Mapped[UUID] = mapped_column(
+        ForeignKey("problem.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Kept current by triggers on bookmark and solved_problem.
+    bookmark_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    solved_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ProblemStats(problem_id={self.problem_id}, bookmark_count={self.bookmark_count}, solved_count={self.solved_count})>"
@@ -21,13 +21,11 @@ class Solution(Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
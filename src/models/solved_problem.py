@@ -0,0 +1,25 @@
+from sqlalchemy import ForeignKey, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from src.core.db import Base
+from uuid import UUID
+
+
+class SolvedProblem(Base):
+    __tablename__ = "solved_problem"
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Second in the primary key, so indexed on its own as well.
+    problem_id: Mapped[UUID] = mapped_column(
+        ForeignKey("problem.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    solved_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+    )
+
+    def __repr__(self):
+        return f"<SolvedProblem(user_id={self.user_id}, problem_id={self.problem_id}, solved_at={self.solved_at})>"
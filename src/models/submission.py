@@ -1,5 +1,14 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import Integer, ForeignKey, Enum, func, TIMESTAMP
+from sqlalchemy import (
+    Enum,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    TIMESTAMP,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from .enum import Status
@@ -14,23 +23,44 @@ if TYPE_CHECKING:
 
 class Submission(Base):
     __tablename__ = "submission"
+    __table_args__ = (
+        # A submission shares created_at with its user_solution, which is
+        # partitioned the same way.
+        ForeignKeyConstraint(
+            ["user_solution_id", "created_at"],
+            ["user_solution.id", "user_solution.created_at"],
+        ),
+        Index(
+            "ix_submission_pending_updated_at",
+            "updated_at",
+            postgresql_where=text("status = 'Pending'"),
+        ),
+        Index(
+            "ix_submission_user_id_problem_id_created_at",
+            "user_id",
+            "problem_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # Monthly partitions; see src.commands.manage_partitions.
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     status: Mapped[Status] = mapped_column(Enum(Status), default=Status.Pending)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
     problem_id: Mapped[UUID] = mapped_column(ForeignKey("problem.id"))
-    user_solution_id: Mapped[UUID] = mapped_column(ForeignKey("user_solution.id"))
+    user_solution_id: Mapped[UUID] = mapped_column()
     passed_testcases: Mapped[int] = mapped_column(Integer)
     total_testcases: Mapped[int] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
+        primary_key=True,
         nullable=False,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
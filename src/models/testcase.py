@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, func, TIMESTAMP
+from sqlalchemy import Index, String, ForeignKey, func, TIMESTAMP
 from datetime import datetime
 from src.core.db import Base
 from uuid import uuid4, UUID
@@ -11,6 +11,9 @@ if TYPE_CHECKING:
 
 class TestCase(Base):
     __tablename__ = "testcase"
+    __table_args__ = (
+        Index("ix_testcase_problem_id_created_at", "problem_id", "created_at", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     problem_id: Mapped[UUID] = mapped_column(
@@ -20,13 +23,11 @@ class TestCase(Base):
     output: Mapped[str] = mapped_column(String)
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
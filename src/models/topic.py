@@ -19,13 +19,11 @@ class Topic(Base):
     list_id: Mapped[UUID] = mapped_column(ForeignKey("list.id", ondelete="CASCADE"))
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
@@ -23,13 +23,11 @@ class User(Base):
     role: Mapped[UserRoles] = mapped_column(Enum(UserRoles), default=UserRoles.USER)
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
@@ -0,0 +1,32 @@
+from sqlalchemy import Date, ForeignKey, Integer, TIMESTAMP, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date, datetime
+from src.core.db import Base
+from uuid import UUID
+
+
+class UserProgress(Base):
+    __tablename__ = "user_progress"
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Kept current by triggers on solved_problem and submission. Months and
+    # days are in UTC; months are keyed "YYYY-MM".
+    total_solved: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    monthly_solved: Mapped[dict[str, int]] = mapped_column(
+        JSONB, nullable=False, default=dict
+    )
+    current_streak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    longest_streak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_solved_on: Mapped[date | None] = mapped_column(Date)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=func.now(),
+        onupdate=func.now(),
+    )
+
+    def __repr__(self):
+        return f"<UserProgress(user_id={self.user_id}, total_solved={self.total_solved}, current_streak={self.current_streak}, longest_streak={self.longest_streak})>"
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, ForeignKey, Boolean, TIMESTAMP, func
+from sqlalchemy import LargeBinary, String, ForeignKey, Boolean, TIMESTAMP, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship, WriteOnlyMapped
 from datetime import datetime
 from src.core.db import Base
@@ -13,9 +13,15 @@ if TYPE_CHECKING:
 
 class UserSolution(Base):
     __tablename__ = "user_solution"
+    # Monthly partitions; see src.commands.manage_partitions.
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    code: Mapped[str] = mapped_column(String)
+    # Only set on rows written before code moved to code_blob.
+    code: Mapped[str | None] = mapped_column(String, nullable=True)
+    code_hash: Mapped[bytes | None] = mapped_column(
+        LargeBinary, ForeignKey("code_blob.hash"), nullable=True
+    )
     has_solved: Mapped[bool] = mapped_column(Boolean, default=False)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
     problem_id: Mapped[UUID] = mapped_column(
@@ -23,13 +29,13 @@ class UserSolution(Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
+        primary_key=True,
         index=True,
         nullable=False,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
-        index=True,
         nullable=False,
         default=func.now(),
         onupdate=func.now(),
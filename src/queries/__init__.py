@@ -0,0 +1,2 @@
+from .registry import Query, QueryRegistry, queries
+from . import user, admin, judge
@@ -0,0 +1,311 @@
+from sqlalchemy import Boolean, Enum, Integer, String, bindparam
+from sqlalchemy.dialects.postgresql import UUID
+from src.models.enum import Difficulty
+from src.queries.registry import queries
+from src.utils.catalog import CATALOG_CHANNEL
+
+queries.register(
+    "admin.problems",
+    """
+    SELECT COALESCE(json_agg(
+        json_build_object(
+            'id', p.id,
+            'name', p.name,
+            'description', p.description,
+            'difficulty', p.difficulty,
+            'starter_code', p.starter_code,
+            'link', p.link,
+            'time_limit', p.time_limit,
+            'memory_limit', p.memory_limit,
+            'created_at', p.created_at,
+            'updated_at', p.updated_at,
+            'rank', p.rank,
+            'testcase', COALESCE(tc.testcases, '[]'::json),
+            'topic_problem', COALESCE(tp.topics, '[]'::json),
+            'list_problem', COALESCE(lp.lists, '[]'::json)
+        )
+    ), '[]')::text AS problems
+    FROM problem p
+    LEFT JOIN (
+        SELECT problem_id, json_agg(
+            json_build_object(
+                'input', input,
+                'output', output
+            )
+        ) AS testcases
+        FROM testcase
+        GROUP BY problem_id
+    ) tc ON tc.problem_id = p.id
+    LEFT JOIN (
+        SELECT tp.problem_id, json_agg(
+            json_build_object(
+                'topic', json_build_object('name', t.name)
+            )
+        ) AS topics
+        FROM topic_problem tp
+        JOIN topic t ON tp.topic_id = t.id
+        GROUP BY tp.problem_id
+    ) tp ON tp.problem_id = p.id
+    LEFT JOIN (
+        SELECT lp.problem_id, json_agg(
+            json_build_object(
+                'list', json_build_object('name', l.name)
+            )
+        ) AS lists
+        FROM list_problem lp
+        JOIN list l ON lp.list_id = l.id
+        GROUP BY lp.problem_id
+    ) lp ON lp.problem_id = p.id
+    """,
+    read_only=True,
+)
+
+queries.register(
+    "admin.problem",
+    """
+    SELECT json_build_object(
+        'id', p.id,
+        'name', p.name,
+        'description', p.description,
+        'difficulty', p.difficulty,
+        'starter_code', p.starter_code,
+        'link', p.link,
+        'time_limit', p.time_limit,
+        'memory_limit', p.memory_limit,
+        'created_at', p.created_at,
+        'updated_at', p.updated_at,
+        'rank', p.rank,
+        'testcase', COALESCE(tc.testcases, '[]'::json),
+        'topic_problem', COALESCE(tp.topics, '[]'::json),
+        'list_problem', COALESCE(lp.lists, '[]'::json),
+        'solution', COALESCE(sol.solutions, '[]'::json)
+    )::text AS problem
+    FROM problem p
+    LEFT JOIN (
+        SELECT problem_id, json_agg(
+            json_build_object(
+                'input', input,
+                'output', output
+            )
+        ) AS testcases
+        FROM testcase
+        GROUP BY problem_id
+    ) tc ON tc.problem_id = p.id
+    LEFT JOIN (
+        SELECT tp.problem_id, json_agg(
+            json_build_object(
+                'topic', json_build_object(
+                    'id', t.id,
+                    'name', t.name
+                )
+            )
+        ) AS topics
+        FROM topic_problem tp
+        JOIN topic t ON tp.topic_id = t.id
+        GROUP BY tp.problem_id
+    ) tp ON tp.problem_id = p.id
+    LEFT JOIN (
+        SELECT lp.problem_id, json_agg(
+            json_build_object(
+                'list', json_build_object(
+                    'id', l.id,
+                    'name', l.name
+                )
+            )
+        ) AS lists
+        FROM list_problem lp
+        JOIN list l ON lp.list_id = l.id
+        GROUP BY lp.problem_id
+    ) lp ON lp.problem_id = p.id
+    LEFT JOIN (
+        SELECT problem_id, json_agg(
+            json_build_object(
+                'code', code,
+                'rank', rank
+            )
+        ) AS solutions
+        FROM solution
+        GROUP BY problem_id
+    ) sol ON sol.problem_id = p.id
+    WHERE p.id = :pid
+    """,
+    bindparam("pid", type_=UUID),
+)
+
+queries.register(
+    "admin.delete_problem",
+    """
+    DELETE FROM problem
+    WHERE id = :problem_id
+    """,
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "admin.problem_id_by_name",
+    """
+    SELECT id FROM problem WHERE name = :name
+    """,
+    bindparam("name", type_=String),
+)
+
+queries.register(
+    "admin.insert_problem",
+    """
+    INSERT INTO problem (
+        id, name, description, difficulty, starter_code, link,
+        rank, time_limit, memory_limit, created_at, updated_at
+    ) VALUES (
+        gen_random_uuid(), :name, :description, :difficulty, :starter_code, :link,
+        :rank, :time_limit, :memory_limit, NOW(), NOW()
+    )
+    RETURNING id
+    """,
+    bindparam("name", type_=String),
+    bindparam("description", type_=String),
+    bindparam("difficulty", type_=Enum(Difficulty)),
+    bindparam("starter_code", type_=String),
+    bindparam("link", type_=String),
+    bindparam("rank", type_=Integer),
+    bindparam("time_limit", type_=Integer),
+    bindparam("memory_limit", type_=Integer),
+)
+
+queries.register(
+    "admin.insert_topic_problem",
+    """
+    INSERT INTO topic_problem (topic_id, problem_id) VALUES (:topic_id, :problem_id)
+    """,
+    bindparam("topic_id", type_=UUID),
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "admin.insert_list_problem",
+    """
+    INSERT INTO list_problem (list_id, problem_id) VALUES (:list_id, :problem_id)
+    """,
+    bindparam("list_id", type_=UUID),
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "admin.insert_testcase",
+    """
+    INSERT INTO testcase (id, problem_id, input, output, created_at, updated_at)
+    VALUES (gen_random_uuid(), :problem_id, :input, :output, NOW(), NOW())
+    """,
+    bindparam("problem_id", type_=UUID),
+    bindparam("input", type_=String),
+    bindparam("output", type_=String),
+)
+
+queries.register(
+    "admin.delete_testcases",
+    """
+    DELETE FROM testcase WHERE problem_id = :problem_id
+    """,
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "admin.problem_exists",
+    """
+    SELECT id FROM problem WHERE id = :problem_id
+    """,
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "admin.update_problem",
+    """
+    UPDATE problem SET
+        name = :name,
+        description = :description,
+        difficulty = :difficulty,
+        starter_code = :starter_code,
+        link = :link,
+        time_limit = :time_limit,
+        memory_limit = :memory_limit,
+        testcase_version = testcase_version + CASE
+          WHEN :testcases_changed
+            OR time_limit IS DISTINCT FROM :time_limit
+            OR memory_limit IS DISTINCT FROM :memory_limit
+          THEN 1 ELSE 0
+        END,
+        updated_at = NOW()
+    WHERE id = :problem_id
+    """,
+    bindparam("name", type_=String),
+    bindparam("description", type_=String),
+    bindparam("difficulty", type_=Enum(Difficulty)),
+    bindparam("starter_code", type_=String),
+    bindparam("link", type_=String),
+    bindparam("time_limit", type_=Integer),
+    bindparam("memory_limit", type_=Integer),
+    bindparam("testcases_changed", type_=Boolean),
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "admin.delete_topic_problems",
+    """
+    DELETE FROM topic_problem WHERE problem_id = :pid
+    """,
+    bindparam("pid", type_=UUID),
+)
+
+queries.register(
+    "admin.delete_list_problems",
+    """
+    DELETE FROM list_problem WHERE problem_id = :pid
+    """,
+    bindparam("pid", type_=UUID),
+)
+
+queries.register(
+    "admin.lists",
+    """
+    SELECT json_agg(
+      json_build_object(
+        'id', l.id,
+        'name', l.name
+      )
+    )::text as lists
+    FROM list l
+    """,
+)
+
+queries.register(
+    "admin.topics",
+    """
+    SELECT json_agg(
+      json_build_object(
+        'id', t.id,
+        'name', t.name,
+        'list_id', t.list_id
+      )
+    )::text as topics
+    FROM topic t
+    """,
+)
+
+queries.register(
+    "admin.notify_catalog_change",
+    f"""
+    WITH v AS (SELECT nextval('catalog_version_seq') AS version)
+    SELECT
+      version,
+      pg_notify(
+        '{CATALOG_CHANNEL}',
+        json_build_object(
+          'entity', :entity,
+          'id', :entity_id,
+          'version', version
+        )::text
+      )
+    FROM v
+    """,
+    bindparam("entity", type_=String),
+    bindparam("entity_id", type_=String),
+)
@@ -0,0 +1,141 @@
+from sqlalchemy import Integer, LargeBinary, String, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from src.queries.registry import queries
+
+queries.register(
+    "judge.problem_tests",
+    """
+    SELECT p.time_limit, p.memory_limit, p.testcase_version, t.input, t.output
+    FROM problem p
+    LEFT JOIN testcase t ON t.problem_id = p.id
+    WHERE p.id = :problem_id
+    ORDER BY t.created_at, t.id
+    """,
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "judge.testcase_version",
+    """
+    SELECT testcase_version FROM problem WHERE id = :problem_id
+    """,
+    bindparam("problem_id", type_=UUID),
+)
+
+queries.register(
+    "judge.cached_verdict",
+    """
+    SELECT status, passed_testcases, total_testcases
+    FROM cached_verdict
+    WHERE code_hash = :code_hash
+      AND problem_id = :problem_id
+      AND testcase_version = :testcase_version
+    """,
+    bindparam("code_hash", type_=LargeBinary),
+    bindparam("problem_id", type_=UUID),
+    bindparam("testcase_version", type_=Integer),
+)
+
+queries.register(
+    "judge.cache_verdict",
+    """
+    INSERT INTO cached_verdict (
+      code_hash, problem_id, testcase_version,
+      status, passed_testcases, total_testcases, created_at
+    )
+    VALUES (
+      :code_hash, :problem_id, :testcase_version,
+      CAST(:status AS status), :passed_testcases, :total_testcases, NOW()
+    )
+    ON CONFLICT DO NOTHING
+    """,
+    bindparam("code_hash", type_=LargeBinary),
+    bindparam("problem_id", type_=UUID),
+    bindparam("testcase_version", type_=Integer),
+    bindparam("status", type_=String),
+    bindparam("passed_testcases", type_=Integer),
+    bindparam("total_testcases", type_=Integer),
+)
+
+queries.register(
+    "judge.record_verdict",
+    """
+    WITH s AS (
+      UPDATE submission
+      SET status = CAST(:status AS status),
+          passed_testcases = :passed_testcases,
+          total_testcases = :total_testcases,
+          updated_at = NOW()
+      WHERE id = :submission_id AND status = 'Pending'
+      RETURNING user_id, problem_id, user_solution_id, status, created_at
+    ),
+    us AS (
+      UPDATE user_solution
+      SET has_solved = s.status = 'Accepted', updated_at = NOW()
+      FROM s
+      WHERE user_solution.id = s.user_solution_id
+        AND user_solution.created_at = s.created_at
+    ),
+    solved AS (
+      INSERT INTO solved_problem (user_id, problem_id, solved_at)
+      SELECT user_id, problem_id, NOW()
+      FROM s
+      WHERE s.status = 'Accepted'
+      ON CONFLICT DO NOTHING
+    )
+    SELECT COUNT(*) FROM s
+    """,
+    bindparam("submission_id", type_=UUID),
+    bindparam("status", type_=String),
+    bindparam("passed_testcases", type_=Integer),
+    bindparam("total_testcases", type_=Integer),
+)
+
+# Claims submissions left Pending by a process that stopped mid-judging.
+# Touching updated_at makes each row claimable by one process only.
+queries.register(
+    "judge.claim_stale_pending",
+    """
+    WITH stale AS (
+      SELECT id, created_at
+      FROM submission
+      WHERE status = 'Pending'
+        AND updated_at < NOW() - make_interval(secs => :stale_seconds)
+      ORDER BY updated_at
+      LIMIT :limit
+      FOR UPDATE SKIP LOCKED
+    ),
+    claimed AS (
+      UPDATE submission s
+      SET updated_at = NOW()
+      FROM stale
+      WHERE s.id = stale.id AND s.created_at = stale.created_at
+      RETURNING s.id, s.user_id, s.problem_id, s.user_solution_id, s.created_at
+    )
+    SELECT
+      c.id AS submission_id,
+      c.user_id,
+      c.problem_id,
+      us.code,
+      cb.dictionary_id AS code_dictionary_id,
+      cb.data AS code_data
+    FROM claimed c
+    JOIN user_solution us
+      ON us.id = c.user_solution_id AND us.created_at = c.created_at
+    LEFT JOIN code_blob cb ON cb.hash = us.code_hash
+    """,
+    bindparam("stale_seconds", type_=Integer),
+    bindparam("limit", type_=Integer),
+)
+
+# Keeps submissions this process is still judging, or has queued, from
+# going stale and being claimed by another.
+queries.register(
+    "judge.renew_pending",
+    """
+    UPDATE submission
+    SET updated_at = NOW()
+    WHERE id = ANY(:submission_ids) AND status = 'Pending'
+    """,
+    bindparam("submission_ids", type_=ARRAY(UUID)),
+)
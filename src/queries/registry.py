@@ -0,0 +1,120 @@
+import time
+from typing import Any, Iterator
+from sqlalchemy import Dialect, Result, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import BindParameter
+
+
+class Query:
+    def __init__(
+        self,
+        name: str,
+        sql: str,
+        *bindparams: BindParameter,
+        read_only: bool = False,
+    ):
+        self.name = name
+        self.read_only = read_only
+        self.sql = sql
+        self.bindparams = bindparams
+        self.statement = text(sql).bindparams(*bindparams) if bindparams else text(sql)
+        self._compiled: dict[str, str] = {}
+
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.prepared_hits = 0
+        self.prepared_misses = 0
+
+    def compile(self, dialect: Dialect) -> str:
+        sql = self._compiled.get(dialect.name)
+        if sql is None:
+            sql = str(self.statement.compile(dialect=dialect))
+            self._compiled[dialect.name] = sql
+        return sql
+
+    def record(self, elapsed: float, prepared: bool | None, failed: bool):
+        self.calls += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        if failed:
+            self.errors += 1
+        if prepared is True:
+            self.prepared_hits += 1
+        elif prepared is False:
+            self.prepared_misses += 1
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_time * 1000, 3),
+            "mean_ms": (
+                round(self.total_time * 1000 / self.calls, 3) if self.calls else None
+            ),
+            "max_ms": round(self.max_time * 1000, 3),
+            "prepared_hits": self.prepared_hits,
+            "prepared_misses": self.prepared_misses,
+        }
+
+
+class QueryRegistry:
+    def __init__(self):
+        self._queries: dict[str, Query] = {}
+
+    def register(
+        self,
+        name: str,
+        sql: str,
+        *bindparams: BindParameter,
+        read_only: bool = False,
+    ) -> Query:
+        if name in self._queries:
+            raise ValueError(f"Query '{name}' is already registered")
+
+        query = Query(name, sql, *bindparams, read_only=read_only)
+        self._queries[name] = query
+        return query
+
+    def __getitem__(self, name: str) -> Query:
+        return self._queries[name]
+
+    def __iter__(self) -> Iterator[Query]:
+        return iter(self._queries.values())
+
+    def compile_all(self, dialect: Dialect):
+        for query in self._queries.values():
+            query.compile(dialect)
+
+    async def execute(
+        self,
+        session: AsyncSession,
+        name: str,
+        params: dict[str, Any] | list[dict[str, Any]] | None = None,
+    ) -> Result:
+        query = self._queries[name]
+        prepared = await self._is_prepared(session, query)
+
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await session.execute(query.statement, params)
+            failed = False
+            return result
+        finally:
+            query.record(time.perf_counter() - start, prepared, failed)
+
+    async def _is_prepared(self, session: AsyncSession, query: Query) -> bool | None:
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        cache = getattr(raw.dbapi_connection, "_prepared_statement_cache", None)
+        if cache is None:
+            return None
+        return query.compile(connection.dialect) in cache
+
+    def stats(self) -> dict:
+        return {query.name: query.stats() for query in self._queries.values()}
+
+
+queries = QueryRegistry()
@@ -0,0 +1,399 @@
+from sqlalchemy import TIMESTAMP, Boolean, Integer, LargeBinary, String, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from src.queries.registry import queries
+
+queries.register(
+    "user.problem_catalog",
+    """
+    SELECT
+      p.id,
+      p.name,
+      p.difficulty,
+      COALESCE(ps.bookmark_count, 0) AS totalBookmarks,
+      COALESCE(ps.solved_count, 0) AS totalUsersSolved,
+      FALSE AS hasSolved,
+      ARRAY_AGG(DISTINCT t.name) FILTER (WHERE t.name IS NOT NULL) AS topics,
+      ARRAY_AGG(DISTINCT l.name) FILTER (WHERE l.name IS NOT NULL) AS lists
+    FROM
+      problem p
+    LEFT JOIN problem_stats ps ON p.id = ps.problem_id
+    LEFT JOIN topic_problem tp ON p.id = tp.problem_id
+    LEFT JOIN topic t ON tp.topic_id = t.id
+    LEFT JOIN list_problem lp ON p.id = lp.problem_id
+    LEFT JOIN list l ON lp.list_id = l.id
+    GROUP BY
+      p.id, p.name, p.difficulty, ps.bookmark_count, ps.solved_count
+    ORDER BY
+      p.rank ASC
+    """,
+)
+
+queries.register(
+    "user.solved_problem_ids",
+    """
+    SELECT problem_id
+    FROM solved_problem
+    WHERE user_id = :user_id
+    """,
+    bindparam("user_id", type_=UUID),
+    read_only=True,
+)
+
+queries.register(
+    "user.problem_by_name",
+    """
+    SELECT
+      p.id,
+      p.name,
+      p.difficulty,
+      p.link,
+      p.starter_code,
+      COALESCE(
+        json_agg(
+          json_build_object(
+            'id', t.id,
+            'input', t.input,
+            'output', t.output
+          )
+        ) FILTER (WHERE t.id IS NOT NULL),
+        '[]'
+      ) AS testcases
+    FROM problem p
+    LEFT JOIN testcase t ON p.id = t.problem_id
+    WHERE p.name = :problem_name
+    GROUP BY p.id
+    """,
+    bindparam("problem_name", type_=String),
+    read_only=True,
+)
+
+queries.register(
+    "user.sidebar",
+    """
+    SELECT json_agg(
+      json_build_object(
+        'name', l.name,
+        'topic', (
+          SELECT json_agg(
+            json_build_object(
+              'name', t.name,
+              'topic_problem', (
+                SELECT json_agg(
+                  json_build_object(
+                    'problem', json_build_object(
+                      'name', p.name,
+                      'difficulty', p.difficulty,
+                      'time_limit', p.time_limit,
+                      'memory_limit', p.memory_limit
+                    )
+                  )
+                )
+                FROM topic_problem tp2
+                JOIN problem p ON p.id = tp2.problem_id
+                JOIN list_problem lp2 ON lp2.problem_id = p.id
+                WHERE tp2.topic_id = t.id AND lp2.list_id = l.id
+              )
+            )
+          )
+          FROM topic t
+          WHERE EXISTS (
+            SELECT 1
+            FROM topic_problem tp
+            JOIN problem p2 ON tp.problem_id = p2.id
+            JOIN list_problem lp ON p2.id = lp.problem_id
+            WHERE tp.topic_id = t.id AND lp.list_id = l.id
+          )
+        )
+      )
+    )::text AS sidebar_data
+    FROM list l;
+    """,
+)
+
+# Both read the user's user_progress row, which triggers keep current. A
+# user with no row yet, or no user, gets zeros.
+queries.register(
+    "user.problem_stat",
+    """
+    SELECT
+        COALESCE(up.total_solved, 0) AS total_problems_solved,
+        ROUND(
+            CASE
+                WHEN COALESCE(m.last_month, 0) = 0 THEN NULL
+                ELSE ((m.current_month - m.last_month) * 100.0 / m.last_month)
+            END,
+            2
+        ) AS percentage_change
+    FROM (SELECT CAST(:user_id AS uuid) AS user_id) u
+    LEFT JOIN user_progress up ON up.user_id = u.user_id
+    LEFT JOIN LATERAL (
+        SELECT
+            COALESCE((up.monthly_solved ->> to_char(
+                NOW() AT TIME ZONE 'UTC', 'YYYY-MM'
+            ))::int, 0) AS current_month,
+            COALESCE((up.monthly_solved ->> to_char(
+                NOW() AT TIME ZONE 'UTC' - INTERVAL '1 month', 'YYYY-MM'
+            ))::int, 0) AS last_month
+    ) m ON TRUE
+    """,
+    bindparam("user_id", type_=UUID),
+    read_only=True,
+)
+
+queries.register(
+    "user.problem_streak",
+    """
+    SELECT
+        CASE
+            -- The streak is over once a whole day has passed without a solve.
+            WHEN up.last_solved_on >= (NOW() AT TIME ZONE 'UTC')::date - 1
+            THEN up.current_streak
+            ELSE 0
+        END AS current_streak,
+        COALESCE(up.longest_streak, 0) AS longest_streak
+    FROM (SELECT CAST(:user_id AS uuid) AS user_id) u
+    LEFT JOIN user_progress up ON up.user_id = u.user_id
+    """,
+    bindparam("user_id", type_=UUID),
+    read_only=True,
+)
+
+queries.register(
+    "user.submissions",
+    """
+    SELECT
+      us.id,
+      s.status,
+      us.user_id,
+      us.problem_id,
+      s.user_solution_id,
+      s.passed_testcases,
+      s.total_testcases,
+      us.created_at,
+      us.updated_at,
+      us.code,
+      us.has_solved,
+      cb.dictionary_id AS code_dictionary_id,
+      cb.data AS code_data
+    FROM submission s
+    LEFT JOIN user_solution us
+      ON us.id = s.user_solution_id AND us.created_at = s.created_at
+    LEFT JOIN code_blob cb ON cb.hash = us.code_hash
+    WHERE s.user_id = :user_id AND s.problem_id = :problem_id
+    ORDER BY s.created_at DESC
+    """,
+    bindparam("user_id", type_=UUID),
+    bindparam("problem_id", type_=UUID),
+)
+
+# Keyset pages over ix_submission_user_id_problem_id_created_at, newest
+# first. Code is left out; it is fetched per submission.
+SUBMISSION_HISTORY_SQL = """
+    SELECT
+      s.id,
+      s.status,
+      s.passed_testcases,
+      s.total_testcases,
+      s.user_solution_id,
+      us.has_solved,
+      s.created_at
+    FROM submission s
+    JOIN user_solution us
+      ON us.id = s.user_solution_id AND us.created_at = s.created_at
+    WHERE s.user_id = :user_id AND s.problem_id = :problem_id
+    {after}
+    ORDER BY s.created_at DESC, s.id DESC
+    LIMIT :limit
+"""
+
+queries.register(
+    "user.submission_history",
+    SUBMISSION_HISTORY_SQL.format(after=""),
+    bindparam("user_id", type_=UUID),
+    bindparam("problem_id", type_=UUID),
+    bindparam("limit", type_=Integer),
+    read_only=True,
+)
+
+queries.register(
+    "user.submission_history_after",
+    SUBMISSION_HISTORY_SQL.format(
+        after="AND (s.created_at, s.id) < (:after_created_at, :after_id)"
+    ),
+    bindparam("user_id", type_=UUID),
+    bindparam("problem_id", type_=UUID),
+    bindparam("after_created_at", type_=TIMESTAMP(timezone=True)),
+    bindparam("after_id", type_=UUID),
+    bindparam("limit", type_=Integer),
+    read_only=True,
+)
+
+queries.register(
+    "user.submission_code",
+    """
+    SELECT
+      s.id AS submission_id,
+      us.id AS solution_id,
+      us.code,
+      cb.dictionary_id AS code_dictionary_id,
+      cb.data AS code_data
+    FROM submission s
+    JOIN user_solution us
+      ON us.id = s.user_solution_id AND us.created_at = s.created_at
+    LEFT JOIN code_blob cb ON cb.hash = us.code_hash
+    WHERE s.id = :submission_id AND s.user_id = :user_id
+    """,
+    bindparam("submission_id", type_=UUID),
+    bindparam("user_id", type_=UUID),
+    read_only=True,
+)
+
+queries.register(
+    "user.submission_verdict",
+    """
+    SELECT status, passed_testcases AS passed, total_testcases AS total
+    FROM submission
+    WHERE id = :submission_id AND user_id = :user_id
+    """,
+    bindparam("submission_id", type_=UUID),
+    bindparam("user_id", type_=UUID),
+    read_only=True,
+)
+
+queries.register(
+    "user.insert_submission",
+    """
+    WITH blob AS (
+      INSERT INTO code_blob (hash, dictionary_id, data, size, created_at)
+      VALUES (:code_hash, :code_dictionary_id, :code_data, :code_size, NOW())
+      ON CONFLICT DO NOTHING
+    ),
+    us AS (
+      INSERT INTO user_solution
+        (id, code_hash, has_solved, user_id, problem_id, created_at, updated_at)
+      VALUES
+        (gen_random_uuid(), :code_hash, :has_solved, :user_id, :problem_id,
+         NOW(), NOW())
+      RETURNING id
+    ),
+    solved AS (
+      -- Only the first acceptance inserts a row, which bumps the solver count.
+      INSERT INTO solved_problem (user_id, problem_id, solved_at)
+      SELECT :user_id, :problem_id, NOW()
+      WHERE CAST(:status AS status) = 'Accepted'
+      ON CONFLICT DO NOTHING
+    )
+    INSERT INTO submission
+      (id, status, user_id, problem_id, user_solution_id,
+       passed_testcases, total_testcases, created_at, updated_at)
+    SELECT gen_random_uuid(), CAST(:status AS status), :user_id, :problem_id,
+           us.id, :passed_testcases, :total_testcases, NOW(), NOW()
+    FROM us
+    RETURNING id, user_solution_id
+    """,
+    bindparam("code_hash", type_=LargeBinary),
+    bindparam("code_dictionary_id", type_=Integer),
+    bindparam("code_data", type_=LargeBinary),
+    bindparam("code_size", type_=Integer),
+    bindparam("has_solved", type_=Boolean),
+    bindparam("user_id", type_=UUID),
+    bindparam("problem_id", type_=UUID),
+    bindparam("status", type_=String),
+    bindparam("passed_testcases", type_=Integer),
+    bindparam("total_testcases", type_=Integer),
+)
+
+# Batched submission writes: one row per array element, so each statement
+# has the same shape, and stays prepared, whatever the batch size.
+queries.register(
+    "user.insert_code_blobs",
+    """
+    INSERT INTO code_blob (hash, dictionary_id, data, size, created_at)
+    SELECT b.hash, b.dictionary_id, b.data, b.size, NOW()
+    FROM unnest(
+      CAST(:hashes AS bytea[]),
+      CAST(:dictionary_ids AS integer[]),
+      CAST(:data AS bytea[]),
+      CAST(:sizes AS integer[])
+    ) AS b(hash, dictionary_id, data, size)
+    ON CONFLICT DO NOTHING
+    """,
+    bindparam("hashes", type_=ARRAY(LargeBinary)),
+    bindparam("dictionary_ids", type_=ARRAY(Integer)),
+    bindparam("data", type_=ARRAY(LargeBinary)),
+    bindparam("sizes", type_=ARRAY(Integer)),
+)
+
+queries.register(
+    "user.insert_user_solutions",
+    """
+    INSERT INTO user_solution
+      (id, code_hash, has_solved, user_id, problem_id, created_at, updated_at)
+    SELECT s.id, s.code_hash, s.has_solved, s.user_id, s.problem_id, NOW(), NOW()
+    FROM unnest(
+      CAST(:ids AS uuid[]),
+      CAST(:code_hashes AS bytea[]),
+      CAST(:has_solved AS boolean[]),
+      CAST(:user_ids AS uuid[]),
+      CAST(:problem_ids AS uuid[])
+    ) AS s(id, code_hash, has_solved, user_id, problem_id)
+    """,
+    bindparam("ids", type_=ARRAY(UUID)),
+    bindparam("code_hashes", type_=ARRAY(LargeBinary)),
+    bindparam("has_solved", type_=ARRAY(Boolean)),
+    bindparam("user_ids", type_=ARRAY(UUID)),
+    bindparam("problem_ids", type_=ARRAY(UUID)),
+)
+
+queries.register(
+    "user.insert_submissions",
+    """
+    INSERT INTO submission
+      (id, status, user_id, problem_id, user_solution_id,
+       passed_testcases, total_testcases, created_at, updated_at)
+    SELECT s.id, s.status, s.user_id, s.problem_id, s.user_solution_id,
+           s.passed_testcases, s.total_testcases, NOW(), NOW()
+    FROM unnest(
+      CAST(:ids AS uuid[]),
+      CAST(:statuses AS status[]),
+      CAST(:user_ids AS uuid[]),
+      CAST(:problem_ids AS uuid[]),
+      CAST(:user_solution_ids AS uuid[]),
+      CAST(:passed_testcases AS integer[]),
+      CAST(:total_testcases AS integer[])
+    ) AS s(id, status, user_id, problem_id, user_solution_id,
+           passed_testcases, total_testcases)
+    """,
+    bindparam("ids", type_=ARRAY(UUID)),
+    bindparam("statuses", type_=ARRAY(String)),
+    bindparam("user_ids", type_=ARRAY(UUID)),
+    bindparam("problem_ids", type_=ARRAY(UUID)),
+    bindparam("user_solution_ids", type_=ARRAY(UUID)),
+    bindparam("passed_testcases", type_=ARRAY(Integer)),
+    bindparam("total_testcases", type_=ARRAY(Integer)),
+)
+
+queries.register(
+    "user.record_solved_many",
+    """
+    INSERT INTO solved_problem (user_id, problem_id, solved_at)
+    SELECT DISTINCT s.user_id, s.problem_id, NOW()
+    FROM unnest(
+      CAST(:user_ids AS uuid[]),
+      CAST(:problem_ids AS uuid[])
+    ) AS s(user_id, problem_id)
+    ON CONFLICT DO NOTHING
+    """,
+    bindparam("user_ids", type_=ARRAY(UUID)),
+    bindparam("problem_ids", type_=ARRAY(UUID)),
+)
+
+queries.register(
+    "user.code_dictionaries",
+    """
+    SELECT id, data
+    FROM code_dictionary
+    ORDER BY id
+    """,
+    read_only=True,
+)
@@ -1,16 +1,17 @@
 from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy import text
 from src.dependencies.admin import get_current_admin_user
 from src.dependencies.core import DBSessionDep
-from src.models.user import User
+from src.queries import queries
+from src.schemas.auth import TokenUser
+from src.utils.responses import RawJSONResponse
 
 list_router = APIRouter(prefix="/list", tags=["List"])
 
 
-@list_router.get("/")
+@list_router.get("/", response_class=RawJSONResponse)
 async def get_lists(
     session: DBSessionDep,
-    admin: User | None = Depends(get_current_admin_user),
+    admin: TokenUser | None = Depends(get_current_admin_user),
 ):
 
     if admin is None:
@@ -18,17 +19,6 @@ async def get_lists(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized role"
         )
 
-    sql = text(
-        """
-        SELECT json_agg(
-          json_build_object(
-            'id', l.id,
-            'name', l.name
-          )
-        ) as lists
-        FROM list l
-"""
-    )
-    result = await session.execute(sql)
+    result = await queries.execute(session, "admin.lists")
     lists = result.scalar_one()
-    return lists
+    return RawJSONResponse(lists)
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, status, HTTPException
+from src.core.admission import admission_stats
+from src.core.batching import submission_batcher
+from src.core.db import sessionmanager
+from src.core.invalidation import catalog_listener
+from src.dependencies.admin import get_current_admin_user
+from src.judge.events import submission_events
+from src.judge.polling import verdict_poller
+from src.judge.pool import judge_pool
+from src.judge.verdicts import verdict_cache
+from src.queries import queries
+from src.schemas.auth import TokenUser
+from src.utils.catalog import catalog_cache
+from src.utils.signin_cache import signin_user_cache
+from src.utils.token import access_token_cache, admin_access_token_cache
+
+metrics_router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@metrics_router.get("/")
+async def get_metrics(admin: TokenUser | None = Depends(get_current_admin_user)):
+    if admin is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized role"
+        )
+
+    return {
+        "token_cache": {
+            "user": access_token_cache.stats(),
+            "admin": admin_access_token_cache.stats(),
+        },
+        "signin_user_cache": signin_user_cache.stats(),
+        "replicas": sessionmanager.replica_stats(),
+        "pool": sessionmanager.pool_stats(),
+        "admission": admission_stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "catalog_listener": catalog_listener.stats(),
+        "queries": queries.stats(),
+        "submission_batcher": submission_batcher.stats(),
+        "judge": judge_pool.stats(),
+        "verdict_cache": verdict_cache.stats(),
+        "judge_events": submission_events.stats(),
+        "verdict_poller": verdict_poller.stats(),
+    }
@@ -6,10 +6,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, EmailStr
 from uuid import UUID
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from src.utils.token import create_admin_access_token
 from src.dependencies.core import DBSessionDep
+from src.core.admission import write_gate
+from src.dependencies.limits import admitted, limit_signins
+from src.utils.google import google_verifier
 from src.models.user import User, UserRoles
 
 sign_in_router = APIRouter(prefix="/signin", tags=["Sign In"])
@@ -28,46 +29,54 @@ class UserResponse(BaseModel):
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
-@sign_in_router.post("/", response_model=UserResponse)
+@sign_in_router.post(
+    "/",
+    response_model=UserResponse,
+    dependencies=[Depends(limit_signins)],
+)
 async def signin_admin(db: DBSessionDep, token: Annotated[str, Depends(oauth2_scheme)]):
     if token == "undefined":
         raise HTTPException(status_code=401, detail="Access token missing or invalid")
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token,
-            requests.Request(),
-            os.environ["GOOGLE_CLIENT_ID_ADMIN"],
-            clock_skew_in_seconds=10,
+        idinfo = await google_verifier.verify(
+            token, os.environ["GOOGLE_CLIENT_ID_ADMIN"]
         )
         email = idinfo["email"]
+    except Exception as e:
+        print("Error", e)
+        raise HTTPException(status_code=401, detail="Something went wrong")
 
-        result = await db.execute(
-            select(User).where(User.email == email and User.role == UserRoles.ADMIN)
-        )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            raise HTTPException(status_code=401, detail="Not authorized")
-
-        jwt_token = create_admin_access_token(
-            {
-                "user_id": str(user.id),
+    # Only the lookup needs the gate, not the certificate check. It is held
+    # outside the try, so a 503 is not turned into a 401.
+    async with admitted(write_gate):
+        try:
+            result = await db.execute(
+                select(User).where(User.email == email and User.role == UserRoles.ADMIN)
+            )
+            user = result.scalar_one_or_none()
+
+            if not user:
+                raise HTTPException(status_code=401, detail="Not authorized")
+
+            jwt_token = create_admin_access_token(
+                {
+                    "user_id": str(user.id),
+                    "email": user.email,
+                    "role": user.role.value,
+                }
+            )
+
+            response_data = {
+                "id": str(user.id),
                 "email": user.email,
                 "role": user.role.value,
+                "server_access_token": jwt_token,
             }
-        )
-
-        response_data = {
-            "id": str(user.id),
-            "email": user.email,
-            "role": user.role.value,
-            "server_access_token": jwt_token,
-        }
 
-        response = JSONResponse(content=response_data)
+            response = JSONResponse(content=response_data)
 
-        return response
+            return response
 
-    except Exception as e:
-        print("Error", e)
-        raise HTTPException(status_code=401, detail="Something went wrong")
+        except Exception as e:
+            print("Error", e)
+            raise HTTPException(status_code=401, detail="Something went wrong")
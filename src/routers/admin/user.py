@@ -0,0 +1,68 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends, status, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import select
+from src.dependencies.admin import get_current_admin_db_user
+from src.dependencies.core import DBSessionDep
+from src.models.enum import UserRoles
+from src.models.user import User
+from src.utils.revocation import revocation_epochs
+from src.utils.signin_cache import signin_user_cache
+
+user_router = APIRouter(prefix="/user", tags=["User"])
+
+
+class RoleUpdateRequest(BaseModel):
+    role: UserRoles
+
+
+async def get_user(session: DBSessionDep, user_id: UUID) -> User:
+    result = await session.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    return user
+
+
+# Both take the admin from the database rather than the token, so an admin
+# demoted a moment ago cannot act on claims that are still signed.
+@user_router.patch("/{user_id}/role", status_code=status.HTTP_200_OK)
+async def update_role(
+    user_id: UUID,
+    data: RoleUpdateRequest,
+    session: DBSessionDep,
+    admin: User | None = Depends(get_current_admin_db_user),
+):
+    if admin is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized role"
+        )
+
+    user = await get_user(session, user_id)
+    email = user.email
+    user.role = data.role
+    # Live tokens carry the old role in their claims.
+    await revocation_epochs.revoke(session, user.id)
+    await session.commit()
+    signin_user_cache.discard(email)
+
+
+@user_router.post("/{user_id}/revoke", status_code=status.HTTP_200_OK)
+async def revoke_sessions(
+    user_id: UUID,
+    session: DBSessionDep,
+    admin: User | None = Depends(get_current_admin_db_user),
+):
+    if admin is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized role"
+        )
+
+    user = await get_user(session, user_id)
+    email = user.email
+    await revocation_epochs.revoke(session, user.id)
+    await session.commit()
+    signin_user_cache.discard(email)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+health_router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@health_router.get("/live")
+async def liveness():
+    return {"status": "ok"}
+
+
+@health_router.get("/ready")
+async def readiness(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up"},
+        )
+
+    return {"status": "ready"}
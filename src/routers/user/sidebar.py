@@ -1,58 +1,26 @@
-from fastapi import APIRouter
-from sqlalchemy import text
+from fastapi import APIRouter, Request
 
 from src.dependencies.core import DBSessionDep
+from src.queries import queries
+from src.utils.catalog import catalog_cache, catalog_response
+from src.utils.responses import RawJSONResponse
 
 sidebar_router = APIRouter(prefix="/sidebar", tags=["Sidebar"])
 
 
-@sidebar_router.get("/")
+@sidebar_router.get("/", response_class=RawJSONResponse)
 async def get_sidebar(
+    request: Request,
     db: DBSessionDep,
-    # user: User | None = Depends(get_current_user),
+    # user: TokenUser | None = Depends(get_current_user),
 ):
-    sql = text(
-        """
-    SELECT json_agg(
-      json_build_object(
-        'name', l.name,
-        'topic', (
-          SELECT json_agg(
-            json_build_object(
-              'name', t.name,
-              'topic_problem', (
-                SELECT json_agg(
-                  json_build_object(
-                    'problem', json_build_object(
-                      'name', p.name,
-                      'difficulty', p.difficulty,
-                      'time_limit', p.time_limit,
-                      'memory_limit', p.memory_limit
-                    )
-                  )
-                )
-                FROM topic_problem tp2
-                JOIN problem p ON p.id = tp2.problem_id
-                JOIN list_problem lp2 ON lp2.problem_id = p.id
-                WHERE tp2.topic_id = t.id AND lp2.list_id = l.id
-              )
-            )
-          )
-          FROM topic t
-          WHERE EXISTS (
-            SELECT 1
-            FROM topic_problem tp
-            JOIN problem p2 ON tp.problem_id = p2.id
-            JOIN list_problem lp ON p2.id = lp.problem_id
-            WHERE tp.topic_id = t.id AND lp.list_id = l.id
-          )
-        )
-      )
-    ) AS sidebar_data
-    FROM list l;
-    """
-    )
 
-    result = await db.execute(sql)
-    sidebar_data = result.scalar()
-    return sidebar_data
+    # Built from the primary: a rebuild right after an admin edit must not
+    # cache a replica's older copy under the new catalog version.
+    async def build_sidebar() -> bytes:
+        result = await queries.execute(db, "user.sidebar")
+        sidebar_data = result.scalar()
+        return (sidebar_data or "null").encode()
+
+    entry = await catalog_cache.get("sidebar", build_sidebar)
+    return await catalog_response(request, entry)
@@ -1,16 +1,21 @@
 import os
+import time
 from typing import Annotated
 from fastapi.responses import JSONResponse
-from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, EmailStr
 from uuid import UUID
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from src.utils.token import create_access_token
 from src.dependencies.core import DBSessionDep
+from src.core.admission import write_gate
+from src.dependencies.limits import admitted, limit_signins
+from src.utils.google import google_verifier
 from src.models.user import User, UserRoles
+from src.schemas.auth import TokenUser
+from src.utils.revocation import revocation_epochs
+from src.utils.signin_cache import SIGNIN_CACHE_SECONDS, signin_user_cache
 
 sign_in_router = APIRouter(prefix="/signin", tags=["Sign In"])
 
@@ -28,7 +33,34 @@ class UserResponse(BaseModel):
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
-@sign_in_router.post("/", response_model=UserResponse)
+async def resolve_user(db: DBSessionDep, email: str) -> TokenUser:
+    entry = signin_user_cache.get(email)
+    if entry is not None:
+        user, cached_at = entry
+        # Role changes and revocations in another worker do not evict here.
+        if not await revocation_epochs.revoked_since(db, user.id, cached_at):
+            return user
+
+    stmt = insert(User).values(email=email, role=UserRoles.USER)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.email], set_={"email": stmt.excluded.email}
+    ).returning(User.id, User.email, User.role)
+
+    result = await db.execute(stmt)
+    row = result.one()
+    await db.commit()
+
+    user = TokenUser(id=row.id, email=row.email, role=row.role)
+    now = time.time()
+    signin_user_cache.set(email, (user, now), now + SIGNIN_CACHE_SECONDS)
+    return user
+
+
+@sign_in_router.post(
+    "/",
+    response_model=UserResponse,
+    dependencies=[Depends(limit_signins)],
+)
 async def signin_user(
     db: DBSessionDep,
     token: Annotated[str, Depends(oauth2_scheme)],
@@ -36,42 +68,37 @@ async def signin_user(
     if token == "undefined":
         raise HTTPException(status_code=401, detail="Access token missing or invalid")
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token,
-            requests.Request(),
-            os.environ["GOOGLE_CLIENT_ID"],
-            clock_skew_in_seconds=10,
-        )
+        idinfo = await google_verifier.verify(token, os.environ["GOOGLE_CLIENT_ID"])
         email = idinfo["email"]
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=401, detail="Something went wrong")
 
-        result = await db.execute(select(User).where(User.email == email))
-        user = result.scalar_one_or_none()
-
-        if not user:
-            user = User(email=email, role=UserRoles.USER)
-            db.add(user)
-            await db.commit()
-            await db.refresh(user)
-
-        jwt_token = create_access_token(
-            {
-                "user_id": str(user.id),
+    # Only the upsert needs the gate, not the certificate check. It is held
+    # outside the try, so a 503 is not turned into a 401.
+    async with admitted(write_gate):
+        try:
+            user = await resolve_user(db, email)
+
+            jwt_token = create_access_token(
+                {
+                    "user_id": str(user.id),
+                    "email": user.email,
+                    "role": user.role.value,
+                }
+            )
+
+            response_data = {
+                "id": str(user.id),
                 "email": user.email,
                 "role": user.role.value,
+                "server_access_token": jwt_token,
             }
-        )
-
-        response_data = {
-            "id": str(user.id),
-            "email": user.email,
-            "role": user.role.value,
-            "server_access_token": jwt_token,
-        }
 
-        response = JSONResponse(content=response_data)
+            response = JSONResponse(content=response_data)
 
-        return response
+            return response
 
-    except Exception as e:
-        print(e)
-        raise HTTPException(status_code=401, detail="Something went wrong")
+        except Exception as e:
+            print(e)
+            raise HTTPException(status_code=401, detail="Something went wrong")
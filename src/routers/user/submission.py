@@ -1,83 +1,258 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import bindparam, text
-from sqlalchemy.dialects.postgresql import UUID as pUUID
-from src.dependencies.core import DBSessionDep
+import asyncio
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from src.core.admission import write_gate
+from src.core.batching import submission_batcher
+from src.core.code_store import code_store
+from src.core.db import sessionmanager
+from src.dependencies.core import DBSessionDep, ReadDBSessionDep
+from src.dependencies.limits import admitted, limit_submissions
 from src.dependencies.user import get_current_user
-from src.models.user import User
+from src.judge.events import (
+    JUDGE_EVENTS_HEARTBEAT_SECONDS,
+    JUDGE_EVENTS_MAX_SECONDS,
+    submission_events,
+)
+from src.judge.polling import verdict_poller
+from src.judge.pool import judge_pool
+from src.judge.service import submission_judge
+from src.schemas.auth import TokenUser
 from src.models.enum import Status
-from src.models.submission import Submission
-from src.models.user_solution import UserSolution
-from src.schemas.submission import SubmissionBody
+from src.queries import queries
+from src.schemas.submission import (
+    SubmissionBody,
+    SubmissionCode,
+    SubmissionHistoryPage,
+)
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.responses import lean_response, sse_event
 
 submission_router = APIRouter(prefix="/submission", tags=["Submission"])
 
 
-@submission_router.get("/{problem_id}")
-async def get_user_submissions(
+@submission_router.get("/history/{problem_id}", response_model=SubmissionHistoryPage)
+async def get_submission_history(
     problem_id: str,
+    session: ReadDBSessionDep,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    user: TokenUser | None = Depends(get_current_user),
+):
+
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    params = {"user_id": str(user.id), "problem_id": problem_id, "limit": limit + 1}
+    if cursor is None:
+        result = await queries.execute(session, "user.submission_history", params)
+    else:
+        try:
+            params["after_created_at"], params["after_id"] = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        result = await queries.execute(
+            session, "user.submission_history_after", params
+        )
+
+    # One extra row is fetched only to tell whether another page exists.
+    items = result.mappings().all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"])
+
+    return lean_response({"items": items, "next_cursor": next_cursor})
+
+
+@submission_router.get("/code/{submission_id}", response_model=SubmissionCode)
+async def get_submission_code(
+    submission_id: str,
+    session: ReadDBSessionDep,
+    user: TokenUser | None = Depends(get_current_user),
+):
+
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    result = await queries.execute(
+        session,
+        "user.submission_code",
+        {"submission_id": submission_id, "user_id": str(user.id)},
+    )
+    row = result.mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return lean_response(await code_store.with_code(session, row))
+
+
+@submission_router.get("/events/{submission_id}")
+async def get_submission_events(
+    submission_id: str,
     session: DBSessionDep,
-    user: User | None = Depends(get_current_user),
+    user: TokenUser | None = Depends(get_current_user),
 ):
+    """Server-sent events: a `test` per finished testcase, then `verdict`.
+
+    Streams of a submission judged in this process all read from its one
+    channel. Otherwise the stream only carries the verdict, which one
+    poller per submission reads from the database for all of them.
+    """
 
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
 
-    sql = text(
-        """
-    SELECT *
-    FROM submission s
-    LEFT JOIN user_solution us ON us.user_id = :user_id
-    WHERE s.user_id = :user_id AND s.problem_id = :problem_id
-    ORDER BY s.created_at DESC
-"""
-    ).bindparams(
-        bindparam("user_id", type_=pUUID),
-        bindparam("problem_id", type_=pUUID),
+    owner = submission_events.owner(submission_id)
+    if owner is not None:
+        if owner != str(user.id):
+            raise HTTPException(status_code=404, detail="Submission not found")
+        events = channel_events(submission_id)
+    else:
+        result = await queries.execute(
+            session,
+            "user.submission_verdict",
+            {"submission_id": submission_id, "user_id": str(user.id)},
+        )
+        row = result.mappings().first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        if row["status"] == Status.Pending.value:
+            verdict_poller.watch(submission_id, user.id)
+            events = channel_events(submission_id)
+        else:
+            events = verdict_events(dict(row))
+
+    # The stream may stay open for minutes; it must not hold a connection.
+    await session.close()
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    result = await session.execute(
-        sql,
+
+async def channel_events(submission_id: str):
+    queue = submission_events.subscribe(submission_id)
+    if queue is None:
+        return
+
+    deadline = time.monotonic() + JUDGE_EVENTS_MAX_SECONDS
+    try:
+        while time.monotonic() < deadline:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), JUDGE_EVENTS_HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        submission_events.unsubscribe(submission_id, queue)
+
+
+async def verdict_events(row: dict):
+    yield sse_event("verdict", {**row, "cached": None, "tests": None})
+
+
+@submission_router.get("/{problem_id}")
+async def get_user_submissions(
+    problem_id: str,
+    session: DBSessionDep,
+    user: TokenUser | None = Depends(get_current_user),
+):
+
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    result = await queries.execute(
+        session,
+        "user.submissions",
         {
             "user_id": str(user.id),
             "problem_id": problem_id,
         },
     )
-    submissions = result.mappings().all()
-    return submissions
+    submissions = [
+        await code_store.with_code(session, row) for row in result.mappings()
+    ]
+    return lean_response(submissions)
 
 
-@submission_router.post("/")
+@submission_router.post("/", dependencies=[Depends(limit_submissions)])
 async def post_user_submission(
     body: SubmissionBody,
     session: DBSessionDep,
-    user: User = Depends(get_current_user),
+    user: TokenUser = Depends(get_current_user),
 ):
 
-    user_solution = UserSolution(
-        code=body.code,
-        has_solved=True if body.total_testcases == body.passed_testcases else False,
-        user_id=user.id,
-        problem_id=body.problem_id,
-    )
-
-    session.add(user_solution)
-    await session.flush()
+    if judge_pool.enabled:
+        if judge_pool.full:
+            raise HTTPException(status_code=503, detail="Judge queue is full")
+        # Counted from here, so requests still writing their submission
+        # cannot all pass the check above.
+        judge_pool.admit()
+        # The verdict comes from the judge; what the client reported is ignored.
+        body = body.model_copy(
+            update={
+                "status": Status.Pending,
+                "passed_testcases": 0,
+                "total_testcases": 0,
+            }
+        )
 
-    submission = Submission(
-        status=body.status if body.status is not None else Status.Accepted,
-        user_id=user.id,
-        problem_id=body.problem_id,
-        user_solution_id=user_solution.id,
-        passed_testcases=body.passed_testcases,
-        total_testcases=body.total_testcases,
-    )
+    try:
+        if submission_batcher.running:
+            # The batcher writes on its own connection, so this waits without
+            # holding one.
+            solution_id, submission_id = await submission_batcher.submit(
+                user.id, body
+            )
+        else:
+            async with admitted(write_gate):
+                solution_id, submission_id = await insert_submission(
+                    session, user, body
+                )
+    except BaseException:
+        if judge_pool.enabled:
+            judge_pool.release()
+        raise
+    sessionmanager.pin_to_primary(user.id)
 
-    session.add(submission)
-    await session.commit()
-    await session.refresh(submission)
+    if judge_pool.enabled:
+        submission_judge.submit(submission_id, body.problem_id, user.id, body.code)
 
     return {
         "message": "Submission created",
-        "solution_id": str(user_solution.id),
-        "submission_id": str(submission.id),
+        "solution_id": str(solution_id),
+        "submission_id": str(submission_id),
     }
+
+
+async def insert_submission(session, user: TokenUser, body: SubmissionBody):
+    # One statement writes the solution, the submission and, on acceptance,
+    # the solved_problem row; no ORM objects are loaded or refreshed.
+    status = body.status if body.status is not None else Status.Accepted
+    code = code_store.encode(body.code)
+    result = await queries.execute(
+        session,
+        "user.insert_submission",
+        {
+            "code_hash": code.hash,
+            "code_dictionary_id": code.dictionary_id,
+            "code_data": code.data,
+            "code_size": code.size,
+            "has_solved": status != Status.Pending
+            and body.total_testcases == body.passed_testcases,
+            "user_id": user.id,
+            "problem_id": body.problem_id,
+            "status": status.value,
+            "passed_testcases": body.passed_testcases,
+            "total_testcases": body.total_testcases,
+        },
+    )
+    submission_id, solution_id = result.one()
+    await session.commit()
+    return solution_id, submission_id
@@ -0,0 +1,9 @@
+from uuid import UUID
+from pydantic import BaseModel
+from src.models.enum import UserRoles
+
+
+class TokenUser(BaseModel):
+    id: UUID
+    email: str
+    role: UserRoles
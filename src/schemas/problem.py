@@ -0,0 +1,29 @@
+from uuid import UUID
+from pydantic import BaseModel
+from src.models.enum import Difficulty
+
+
+class ProblemSummary(BaseModel):
+    id: UUID
+    name: str
+    difficulty: Difficulty
+    totalbookmarks: int
+    totaluserssolved: int
+    hassolved: bool
+    topics: list[str] | None
+    lists: list[str] | None
+
+
+class TestCaseOut(BaseModel):
+    id: UUID
+    input: str
+    output: str
+
+
+class ProblemDetail(BaseModel):
+    id: UUID
+    name: str
+    difficulty: Difficulty
+    link: str | None
+    starter_code: str
+    testcases: list[TestCaseOut]
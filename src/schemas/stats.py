@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class ProblemStat(BaseModel):
+    total_problems_solved: int
+    percentage_change: float | None
+
+
+class ProblemStreak(BaseModel):
+    current_streak: int
+    longest_streak: int
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel
 from src.models.enum import Status
@@ -9,3 +10,24 @@ class SubmissionBody(BaseModel):
     passed_testcases: int
     total_testcases: int
     code: str
+
+
+class SubmissionHistoryItem(BaseModel):
+    id: UUID
+    status: Status
+    passed_testcases: int
+    total_testcases: int
+    user_solution_id: UUID
+    has_solved: bool
+    created_at: datetime
+
+
+class SubmissionHistoryPage(BaseModel):
+    items: list[SubmissionHistoryItem]
+    next_cursor: str | None
+
+
+class SubmissionCode(BaseModel):
+    submission_id: UUID
+    solution_id: UUID
+    code: str
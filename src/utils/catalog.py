@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from fastapi import Request, Response, status
+
+from src.utils.compression import (
+    PrecompressedBody,
+    choose_encoding,
+    compressed_response,
+)
+
+CATALOG_CHANNEL = "catalog_invalidation"
+
+
+class CatalogEntry(NamedTuple):
+    version: int
+    value: Any
+    etag: str | None
+    expires_at: float | None
+
+
+class CatalogCache:
+    """Per-process cache of data derived from the problem catalog.
+
+    Entries are only valid for the catalog version they were built under;
+    admin edits advance the version, which drops everything built before it.
+    Entries built with a max_age are also rebuilt once that many seconds pass.
+    """
+
+    def __init__(self):
+        self.version = 0
+        # Changes on every advance or flush, so a build that raced with one
+        # is never stored.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, CatalogEntry] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def advance(self, version: int):
+        # Writes can commit, and so notify, out of version order, and a late
+        # lower version still means the catalog changed: always flush.
+        self.flush(max(self.version, version))
+
+    def flush(self, version: int | None = None):
+        # Unlike advance, a flush may move the version backwards, e.g. when
+        # the listener reconnects to a freshly restored database.
+        if version is not None:
+            self.version = version
+        self._generation += 1
+        self._entries.clear()
+
+    async def get(
+        self,
+        key: str,
+        build: Callable[[], Awaitable[Any]],
+        max_age: float | None = None,
+    ) -> CatalogEntry:
+        entry = self._entries.get(key)
+        if self._is_fresh(entry):
+            self.hits += 1
+            return entry
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Concurrent misses wait here and reuse the first build.
+            entry = self._entries.get(key)
+            if self._is_fresh(entry):
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            version, generation = self.version, self._generation
+            value = await build()
+            etag = None
+            if isinstance(value, bytes):
+                etag = make_etag(value)
+                value = PrecompressedBody(value)
+            entry = CatalogEntry(
+                version,
+                value,
+                etag,
+                time.monotonic() + max_age if max_age is not None else None,
+            )
+            # An edit that landed mid-build must not be hidden by stale data.
+            if generation == self._generation:
+                self._entries[key] = entry
+            return entry
+
+    def _is_fresh(self, entry: CatalogEntry | None) -> bool:
+        if entry is None:
+            return False
+        return entry.expires_at is None or time.monotonic() < entry.expires_at
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "version": self.version,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
+
+
+def make_etag(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored, and
+    # a tag handed out for any encoding of the same body matches.
+    return any(
+        tag.strip().removeprefix("W/").strip('"').split("-")[0] == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+async def catalog_response(request: Request, entry: CatalogEntry) -> Response:
+    # Each encoding is a different representation, so it gets its own tag.
+    encoding = choose_encoding(request, entry.value.body)
+    etag = f'"{entry.etag}-{encoding}"' if encoding else f'"{entry.etag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, entry.etag):
+        headers["Vary"] = "Accept-Encoding"
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return await compressed_response(request, entry.value, headers)
+
+
+catalog_cache = CatalogCache()
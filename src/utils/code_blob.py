@@ -0,0 +1,42 @@
+import hashlib
+import zstandard
+
+CODE_COMPRESSION_LEVEL = 9
+
+
+def code_hash(code: str) -> bytes:
+    return hashlib.sha256(code.encode("utf-8")).digest()
+
+
+def normalized_code_hash(code: str) -> bytes:
+    # Only differences that cannot change what the program does: line
+    # endings and whitespace after the last statement.
+    code = code.replace("\r\n", "\n").replace("\r", "\n").rstrip()
+    return code_hash(code)
+
+
+def code_compressor(
+    dictionary: bytes | None = None, level: int = CODE_COMPRESSION_LEVEL
+) -> zstandard.ZstdCompressor:
+    # The dictionary id is stored next to each blob, so frames carry neither
+    # that nor a checksum; only the content size is kept.
+    return zstandard.ZstdCompressor(
+        level=level,
+        dict_data=zstandard.ZstdCompressionDict(dictionary) if dictionary else None,
+        write_checksum=False,
+        write_dict_id=False,
+    )
+
+
+def code_decompressor(dictionary: bytes | None = None) -> zstandard.ZstdDecompressor:
+    return zstandard.ZstdDecompressor(
+        dict_data=zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+    )
+
+
+def train_dictionary(samples: list[str], size: int) -> bytes:
+    # Raises zstandard.ZstdError when there is too little sample data.
+    dictionary = zstandard.train_dictionary(
+        size, [sample.encode("utf-8") for sample in samples]
+    )
+    return dictionary.as_bytes()
@@ -0,0 +1,100 @@
+import asyncio
+import gzip
+import os
+
+import brotli
+import zstandard
+from fastapi import Request, Response
+
+from src.utils.responses import RawJSONResponse
+
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+
+# Cached bodies are compressed once per encoding, so they can afford the
+# slower, denser levels; per-request bodies use the fast ones.
+_COMPRESSORS = {
+    "zstd": (
+        lambda body: zstandard.ZstdCompressor(level=3).compress(body),
+        lambda body: zstandard.ZstdCompressor(level=19).compress(body),
+    ),
+    "br": (
+        lambda body: brotli.compress(body, quality=4),
+        lambda body: brotli.compress(body, quality=11),
+    ),
+    "gzip": (
+        lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+        lambda body: gzip.compress(body, compresslevel=9, mtime=0),
+    ),
+}
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    fast, dense = _COMPRESSORS[encoding]
+    return dense(body) if best else fast(body)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    # Ties go to the first encoding in _COMPRESSORS.
+    best, best_weight = None, 0.0
+    for encoding in _COMPRESSORS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class PrecompressedBody:
+    """A response body and its compressed variants, each made at most once."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: dict[str, bytes] = {}
+
+    async def encoded(self, encoding: str) -> bytes:
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = await asyncio.to_thread(compress, self.body, encoding, True)
+            self._variants[encoding] = variant
+        return variant
+
+
+def choose_encoding(request: Request, body: bytes) -> str | None:
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return None
+    return negotiate(request.headers.get("accept-encoding"))
+
+
+async def compressed_response(
+    request: Request,
+    body: bytes | PrecompressedBody,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    raw = body.body if isinstance(body, PrecompressedBody) else body
+
+    encoding = choose_encoding(request, raw)
+    if encoding is None:
+        return RawJSONResponse(raw, headers=headers)
+
+    if isinstance(body, PrecompressedBody):
+        content = await body.encoded(encoding)
+    else:
+        content = compress(raw, encoding)
+    headers["Content-Encoding"] = encoding
+    return RawJSONResponse(content, headers=headers)
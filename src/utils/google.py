@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from google.auth import jwt as google_jwt
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+DEFAULT_CERTS_MAX_AGE = 3600
+CLOCK_SKEW_SECONDS = 10
+
+# A cert source returns ({kid: PEM certificate}, max_age_seconds).
+CertSource = Callable[[], Awaitable[tuple[dict[str, str], int]]]
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+async def fetch_google_certs() -> tuple[dict[str, str], int]:
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        response = await client.get(GOOGLE_CERTS_URL)
+        response.raise_for_status()
+
+    match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    max_age = int(match.group(1)) if match else DEFAULT_CERTS_MAX_AGE
+    return response.json(), max_age
+
+
+class GoogleIdTokenVerifier:
+    """Verifies Google ID tokens against an in-memory copy of Google's certs.
+
+    Certs are refreshed in the background shortly before their Cache-Control
+    max-age runs out; the RS256 check itself runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        source: CertSource = fetch_google_certs,
+        refresh_margin: int = 300,
+        min_refresh_interval: int = 60,
+    ):
+        self._source = source
+        self._refresh_margin = refresh_margin
+        self._min_refresh_interval = min_refresh_interval
+        self._certs: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def verify(self, token: str, audience: str) -> dict:
+        certs = await self._get_certs()
+
+        key_id = google_jwt.decode_header(token).get("kid")
+        if key_id not in certs:
+            # Google rotated its keys before our copy expired.
+            certs = await self._refresh(force=True)
+
+        idinfo = await asyncio.to_thread(
+            google_jwt.decode,
+            token,
+            certs=certs,
+            audience=audience,
+            clock_skew_in_seconds=CLOCK_SKEW_SECONDS,
+        )
+
+        if idinfo.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+
+        return idinfo
+
+    async def _get_certs(self) -> dict[str, str]:
+        now = time.monotonic()
+        if not self._certs or now >= self._expires_at:
+            return await self._refresh()
+
+        if now >= self._refresh_at and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+        return self._certs
+
+    async def _background_refresh(self):
+        try:
+            await self._refresh()
+        except Exception:
+            logger.exception("Failed to refresh Google certs")
+
+    async def _refresh(self, force: bool = False) -> dict[str, str]:
+        async with self._lock:
+            now = time.monotonic()
+            if self._certs and now < self._refresh_at:
+                if not force or now - self._fetched_at < self._min_refresh_interval:
+                    return self._certs
+
+            certs, max_age = await self._source()
+            self._certs = certs
+            self._fetched_at = time.monotonic()
+            self._expires_at = self._fetched_at + max_age
+            self._refresh_at = self._fetched_at + max(
+                max_age - self._refresh_margin, max_age // 2
+            )
+            return self._certs
+
+
+google_verifier = GoogleIdTokenVerifier()
@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    # Raises ValueError for anything encode_cursor could not have produced.
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+
+    created_at, _, id = raw.partition("|")
+    timestamp = datetime.fromisoformat(created_at)
+    if timestamp.tzinfo is None:
+        raise ValueError("Malformed cursor")
+    return timestamp, UUID(id)
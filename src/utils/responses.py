@@ -0,0 +1,62 @@
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+class RawJSONResponse(Response):
+    """Sends JSON that is already serialised, e.g. built by Postgres, as-is."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if content is None:
+            return b"null"
+        if isinstance(content, str):
+            return content.encode("utf-8")
+        return bytes(content)
+
+
+def _default(obj: Any) -> Any:
+    # orjson already handles datetimes, dates, enums and exact uuid.UUIDs;
+    # these are the other types our handlers return, encoded the way
+    # jsonable_encoder does. asyncpg hands back its own UUID subclass.
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_bytes(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    # One server-sent event; orjson never emits newlines, so data fits on
+    # a single line.
+    return b"event: " + event.encode() + b"\ndata: " + json_bytes(data) + b"\n\n"
+
+
+class FastJSONResponse(JSONResponse):
+    """The app's default response class, encoding with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
+
+
+def lean_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    # Returning a Response skips jsonable_encoder and any response_model
+    # validation, so the model only documents the route. Only for rows we
+    # produced ourselves.
+    return FastJSONResponse(content, status_code=status_code)
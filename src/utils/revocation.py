@@ -0,0 +1,69 @@
+import asyncio
+import time
+from datetime import timedelta
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.auth_epoch import AuthEpoch
+from src.utils.token import JWT_EXPIRE_MINUTES
+
+REFRESH_INTERVAL_SECONDS = 30
+
+
+class RevocationEpochs:
+    """In-process copy of the auth_epoch table.
+
+    A token issued at or before its user's epoch is rejected, so the user
+    has to sign in again and gets claims that match the user row. Only
+    epochs recent enough to affect a live token are loaded.
+    """
+
+    def __init__(self, refresh_interval: int = REFRESH_INTERVAL_SECONDS):
+        self._refresh_interval = refresh_interval
+        self._epochs: dict[str, float] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def is_revoked(self, db: AsyncSession, payload: dict) -> bool:
+        await self._refresh_if_stale(db)
+        epoch = self._epochs.get(payload["user_id"])
+        if epoch is None:
+            return False
+
+        issued_at = payload.get("iat")
+        return issued_at is None or issued_at <= epoch
+
+    async def revoked_since(self, db: AsyncSession, user_id: str, since: float) -> bool:
+        await self._refresh_if_stale(db)
+        epoch = self._epochs.get(str(user_id))
+        return epoch is not None and epoch >= since
+
+    async def revoke(self, db: AsyncSession, user_id: str):
+        stmt = insert(AuthEpoch).values(user_id=user_id, epoch=func.now())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AuthEpoch.user_id], set_={"epoch": func.now()}
+        )
+        await db.execute(stmt)
+        self._epochs[str(user_id)] = time.time()
+
+    async def _refresh_if_stale(self, db: AsyncSession):
+        if time.monotonic() - self._loaded_at < self._refresh_interval:
+            return
+
+        async with self._lock:
+            if time.monotonic() - self._loaded_at < self._refresh_interval:
+                return
+
+            result = await db.execute(
+                select(AuthEpoch.user_id, AuthEpoch.epoch).where(
+                    AuthEpoch.epoch
+                    > func.now() - timedelta(minutes=JWT_EXPIRE_MINUTES + 1)
+                )
+            )
+            self._epochs = {
+                str(user_id): epoch.timestamp() for user_id, epoch in result.all()
+            }
+            self._loaded_at = time.monotonic()
+
+
+revocation_epochs = RevocationEpochs()
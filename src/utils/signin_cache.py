@@ -0,0 +1,7 @@
+from src.utils.cache import TTLCache
+
+SIGNIN_CACHE_SECONDS = 60
+
+# Short-lived email -> (user, cached at) cache so bursts of logins skip
+# Postgres.
+signin_user_cache = TTLCache(maxsize=4096)
@@ -1,8 +1,10 @@
+import hashlib
 import os
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import jwt
 from dotenv import load_dotenv
+from src.utils.cache import TTLCache
 
 load_dotenv()
 
@@ -10,24 +12,45 @@ JWT_SECRET_KEY = os.environ["JWT_SECRET_KEY"]
 JWT_SECRET_KEY_ADMIN = os.environ["JWT_SECRET_KEY_ADMIN"]
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = 60
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 4096))
+
+# Verified payloads keyed by token digest, each evicted at the token's exp.
+# Payloads are shared between requests and must not be mutated.
+access_token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+admin_access_token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _decode_cached(token: str, secret: str, cache: TTLCache) -> Optional[dict]:
+    key = _token_digest(token)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    try:
+        payload = jwt.decode(token, secret, algorithms=[JWT_ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        return None
+    except jwt.PyJWTError:
+        return None
+
+    cache.set(key, payload, payload["exp"])
+    return payload
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now() + (expires_delta or timedelta(minutes=JWT_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.PyJWTError:
-        return None
+    return _decode_cached(token, JWT_SECRET_KEY, access_token_cache)
 
 
 def create_admin_access_token(
@@ -35,16 +58,10 @@ def create_admin_access_token(
 ) -> str:
     to_encode = data.copy()
     expire = datetime.now() + (expires_delta or timedelta(minutes=JWT_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY_ADMIN, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
 def decode_admin_access_token(token: str) -> Optional[dict]:
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY_ADMIN, algorithms=[JWT_ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.PyJWTError:
-        return None
+    return _decode_cached(token, JWT_SECRET_KEY_ADMIN, admin_access_token_cache)
@@ -0,0 +1,6 @@
+import os
+
+# Settings read at import time. Nothing here connects unless a test does.
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://postgres@localhost/async0")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("JWT_SECRET_KEY_ADMIN", "test-admin-secret-key")
@@ -0,0 +1,47 @@
+import asyncio
+from uuid import uuid4
+from sqlalchemy.exc import IntegrityError, OperationalError
+from src.core.batching import SubmissionBatcher, SubmissionIds, _QueuedSubmission
+
+
+def _flush(fail):
+    """Writes four submissions; fail(bodies) returns the error to raise, if any."""
+
+    async def run():
+        batcher = SubmissionBatcher()
+        loop = asyncio.get_running_loop()
+        batch = [
+            _QueuedSubmission(
+                uuid4(), body, SubmissionIds(uuid4(), uuid4()), loop.create_future()
+            )
+            for body in range(4)
+        ]
+        writes = []
+
+        async def write(items):
+            writes.append(len(items))
+            error = fail([item.body for item in items])
+            if error is not None:
+                raise error
+
+        batcher._write = write
+        await batcher._write_isolating_failures(batch)
+        return writes, [item.future.exception() is None for item in batch]
+
+    return asyncio.run(run())
+
+
+def test_bad_row_is_isolated():
+    writes, written = _flush(
+        lambda bodies: (
+            IntegrityError("INSERT", {}, Exception()) if 2 in bodies else None
+        )
+    )
+    assert written == [True, True, False, True]
+    assert writes == [4, 2, 2, 1, 1]
+
+
+def test_connection_error_fails_batch_at_once():
+    writes, written = _flush(lambda bodies: OperationalError("INSERT", {}, Exception()))
+    assert writes == [4]
+    assert written == [False] * 4
@@ -0,0 +1,43 @@
+import asyncio
+import json
+from src.core.invalidation import CatalogInvalidationListener
+from src.utils.catalog import CatalogCache
+
+
+def cached(cache: CatalogCache, key: str) -> bool:
+    async def build():
+        return key
+
+    asyncio.run(cache.get(key, build))
+    return key in cache._entries
+
+
+def notify(listener: CatalogInvalidationListener, version: int):
+    listener._on_notify(None, 0, listener.channel, json.dumps({"version": version}))
+
+
+def test_advance_flushes_on_a_lower_version():
+    cache = CatalogCache()
+    cache.advance(5)
+    assert cached(cache, "sidebar")
+
+    cache.advance(4)
+
+    assert "sidebar" not in cache._entries
+    assert cache.version == 5
+
+
+def test_notifications_out_of_order_flush_every_time():
+    cache = CatalogCache()
+    listener = CatalogInvalidationListener(cache)
+
+    notify(listener, 2)
+    assert cached(cache, "testcase_version:p1")
+    notify(listener, 1)
+    assert "testcase_version:p1" not in cache._entries
+    assert cache.version == 2
+
+    assert cached(cache, "testcase_version:p1")
+    notify(listener, 3)
+    assert "testcase_version:p1" not in cache._entries
+    assert cache.version == 3
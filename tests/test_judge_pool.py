@@ -0,0 +1,36 @@
+import pytest
+from src.judge import sandbox
+from src.judge.pool import JudgePool
+
+
+def test_admitted_submissions_count_towards_full():
+    pool = JudgePool(workers=1, max_queue=1, tasks_per_worker=1)
+    pool.admit()
+    assert not pool.full
+
+    pool.admit()
+    assert pool.full
+    assert pool.stats()["queued"] == 2
+
+    pool.release()
+    assert not pool.full
+
+
+def test_unconfined_sandbox_refuses_unless_allowed(monkeypatch):
+    monkeypatch.setattr(
+        sandbox,
+        "features",
+        lambda: {"seccomp": False, "unprivileged_uid": True, "network_namespace": True},
+    )
+    with pytest.raises(Exception, match="seccomp"):
+        JudgePool(workers=1, max_queue=1, tasks_per_worker=1).check_confinement()
+
+    pool = JudgePool(workers=1, max_queue=1, tasks_per_worker=1, allow_unconfined=True)
+    pool.check_confinement()
+
+
+def test_job_without_tests_is_not_accepted():
+    result = sandbox.judge(
+        sandbox.JudgeJob(code="", tests=[], time_limit_ms=1000, memory_limit_mb=64)
+    )
+    assert result.status == sandbox.SYSTEM_ERROR
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+import pytest
+
+# The check needs real data to sample parameters and size tables from.
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("CHECK_QUERY_PLANS"),
+    reason="set CHECK_QUERY_PLANS with DATABASE_URL pointing at a seeded database",
+)
+
+
+def test_no_query_scans_a_large_table():
+    # A process of its own, as the command closes the engine when done.
+    result = subprocess.run(
+        [sys.executable, "-m", "src.commands.check_query_plans"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,34 @@
+from uuid import uuid4
+from starlette.requests import Request
+from src.dependencies.core import _bearer_user_id
+from src.utils.token import create_access_token, create_admin_access_token
+
+
+def bearer(token: str, path: str = "/api/v1/user/submission/") -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "path": path, "headers": headers})
+
+
+def test_user_and_admin_tokens_resolve_the_pin_key():
+    user_id = str(uuid4())
+    admin_id = str(uuid4())
+    user_token = create_access_token({"user_id": user_id})
+    admin_token = create_admin_access_token({"user_id": admin_id})
+
+    assert _bearer_user_id(bearer(user_token)) == user_id
+    assert _bearer_user_id(bearer(admin_token, "/api/v1/admin/problem/")) == admin_id
+
+
+def test_tokens_are_only_decoded_for_their_own_routes():
+    user_token = create_access_token({"user_id": str(uuid4())})
+    admin_token = create_admin_access_token({"user_id": str(uuid4())})
+
+    assert _bearer_user_id(bearer(admin_token)) is None
+    assert _bearer_user_id(bearer(user_token, "/api/v1/admin/problem/")) is None
+
+
+def test_unknown_tokens_are_not_pinned():
+    assert _bearer_user_id(bearer("not-a-token")) is None
+    assert (
+        _bearer_user_id(Request({"type": "http", "path": "/", "headers": []})) is None
+    )
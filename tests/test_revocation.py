@@ -0,0 +1,67 @@
+import asyncio
+import time
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from src.dependencies import admin as admin_deps
+from src.dependencies import user as user_deps
+from src.utils.revocation import RevocationEpochs
+from src.utils.token import create_access_token, create_admin_access_token
+
+
+class FakeSession:
+    async def execute(self, statement):
+        pass
+
+
+def bearer(token: str) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+def claims(role: str) -> dict:
+    return {"user_id": str(uuid4()), "email": "a@example.com", "role": role}
+
+
+@pytest.fixture
+def epochs(monkeypatch) -> RevocationEpochs:
+    # Loaded already, so nothing reads auth_epoch.
+    epochs = RevocationEpochs()
+    epochs._loaded_at = time.monotonic()
+    monkeypatch.setattr(user_deps, "revocation_epochs", epochs)
+    return epochs
+
+
+def test_revoked_token_is_rejected(epochs):
+    user = claims("USER")
+    request = bearer(create_access_token(user))
+    assert asyncio.run(user_deps.get_current_user(request, FakeSession()))
+
+    asyncio.run(epochs.revoke(FakeSession(), user["user_id"]))
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(user_deps.get_current_user(request, FakeSession()))
+    assert e.value.status_code == 401
+
+
+def test_revoked_admin_token_is_rejected(epochs):
+    admin = claims("ADMIN")
+    request = bearer(create_admin_access_token(admin))
+    assert asyncio.run(admin_deps.get_current_admin_user(request, FakeSession()))
+
+    asyncio.run(epochs.revoke(FakeSession(), admin["user_id"]))
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(admin_deps.get_current_admin_user(request, FakeSession()))
+    assert e.value.status_code == 401
+
+
+def test_token_issued_after_revocation_is_accepted(epochs):
+    user = claims("USER")
+    epochs._epochs[user["user_id"]] = time.time() - 60
+
+    request = bearer(create_access_token(user))
+    current = asyncio.run(user_deps.get_current_user(request, FakeSession()))
+
+    assert str(current.id) == user["user_id"]
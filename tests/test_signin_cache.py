@@ -0,0 +1,57 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+from src.models.enum import UserRoles
+from src.routers.user import signin
+from src.schemas.auth import TokenUser
+from src.utils.revocation import RevocationEpochs
+from src.utils.signin_cache import signin_user_cache
+
+
+class UpsertSession:
+    """Answers the sign-in upsert with `row`."""
+
+    def __init__(self, row):
+        self.row = row
+        self.executed = 0
+
+    async def execute(self, statement):
+        self.executed += 1
+        return SimpleNamespace(one=lambda: self.row)
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def epochs(monkeypatch) -> RevocationEpochs:
+    epochs = RevocationEpochs()
+    epochs._loaded_at = time.monotonic()
+    monkeypatch.setattr(signin, "revocation_epochs", epochs)
+    signin_user_cache.clear()
+    return epochs
+
+
+def test_cached_user_skips_the_database(epochs):
+    user = TokenUser(id=uuid4(), email="a@example.com", role=UserRoles.ADMIN)
+    signin_user_cache.set(user.email, (user, time.time()), time.time() + 60)
+    db = UpsertSession(None)
+
+    assert asyncio.run(signin.resolve_user(db, user.email)) == user
+    assert db.executed == 0
+
+
+def test_cached_user_is_reloaded_after_revocation(epochs):
+    user = TokenUser(id=uuid4(), email="a@example.com", role=UserRoles.ADMIN)
+    signin_user_cache.set(user.email, (user, time.time() - 1), time.time() + 60)
+    epochs._epochs[str(user.id)] = time.time()
+    db = UpsertSession(
+        SimpleNamespace(id=user.id, email=user.email, role=UserRoles.USER)
+    )
+
+    resolved = asyncio.run(signin.resolve_user(db, user.email))
+
+    assert resolved.role == UserRoles.USER
+    assert db.executed == 1
@@ -0,0 +1,44 @@
+import asyncio
+from src.judge.events import SubmissionEvents
+from src.judge.polling import VerdictPoller
+
+
+def test_streams_share_one_poll():
+    async def run():
+        events = SubmissionEvents(buffer=8, linger=0)
+        poller = VerdictPoller(events, interval=60, max_seconds=60)
+        poller.watch("s1", "u1")
+        poller.watch("s1", "u1")
+        tasks = len(poller._tasks)
+        await poller.close()
+        return tasks
+
+    assert asyncio.run(run()) == 1
+
+
+def test_poll_stops_without_streams():
+    async def run():
+        events = SubmissionEvents(buffer=8, linger=0)
+        poller = VerdictPoller(events, interval=0.01, max_seconds=60)
+        poller.watch("s1", "u1")
+        await asyncio.gather(*poller._tasks.values())
+        return poller.polls, events.owner("s1")
+
+    assert asyncio.run(run()) == (0, None)
+
+
+def test_judge_takes_over_polled_streams():
+    async def run():
+        events = SubmissionEvents(buffer=8, linger=0)
+        poller = VerdictPoller(events, interval=0.01, max_seconds=60)
+        poller.watch("s1", "u1")
+        queue = events.subscribe("s1")
+
+        events.open("s1", "u1")
+        events.publish("s1", "verdict", {"status": "Accepted"})
+        await asyncio.gather(*poller._tasks.values())
+        return queue.get_nowait(), poller.polls
+
+    message, polls = asyncio.run(run())
+    assert message.startswith(b"event: verdict")
+    assert polls == 0